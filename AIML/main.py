@@ -1,21 +1,37 @@
 # main.py
+import array
 import asyncio
+import atexit
+import gzip
 import logging
+import logging.handlers
+import math
+import os
+import queue
 import random
 import sqlite3
+import sys
+import threading
 import time
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
-from fastapi.responses import HTMLResponse
+from filelock import FileLock
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, conlist
 from pydantic_settings import BaseSettings
 
+try:
+    import brotli
+except ImportError:  # brotli is optional; fall back to gzip only
+    brotli = None
+
 
 # Configuration
 class Settings(BaseSettings):
@@ -24,12 +40,15 @@ class Settings(BaseSettings):
     app_name: str = "ML Model Serving API"
     debug: bool = True
     db_path: str = "predictions.db"
+    db_pool_size: int = 8
+    write_batch_size: int = 256
+    write_batch_delay_ms: int = 0
     log_file: str = "app.log"
 
 
 # Pydantic models
 class PredictionRequest(BaseModel):
-    features: List[float]
+    features: conlist(float, min_length=1)
 
 
 class PredictionResponse(BaseModel):
@@ -54,54 +73,267 @@ class PredictionError(Exception):
         self.message = message
 
 
+# Feature vectors are stored as packed float64 BLOBs
+def pack_features(features: List[float]) -> bytes:
+    """Serialize a feature vector to raw float64 bytes"""
+    return array.array("d", features).tobytes()
+
+
+def unpack_features(blob: bytes) -> List[float]:
+    """Deserialize raw float64 bytes back to a feature vector"""
+    return array.array("d", blob).tolist()
+
+
+def compute_prediction(features: List[float]) -> float:
+    """Simple prediction: sum of features"""
+    return math.fsum(features)
+
+
 # Database dependency
+class ConnectionPool:
+    """Bounded pool of long-lived SQLite connections"""
+    
+    def __init__(self, factory, size: int = 8):
+        self._pool = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(factory())
+    
+    def get(self) -> sqlite3.Connection:
+        """Borrow a connection, blocking until one is available"""
+        return self._pool.get()
+    
+    def put(self, conn: sqlite3.Connection):
+        """Return a borrowed connection to the pool"""
+        self._pool.put(conn)
+    
+    def close(self):
+        """Close every idle connection held by the pool"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 class DatabaseManager:
-    def __init__(self, db_path: str):
+    # Per-connection tuning; journal_mode=WAL is persisted in the database file
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-64000",
+        "PRAGMA mmap_size=268435456",
+        "PRAGMA busy_timeout=5000",
+    )
+    
+    # Statements are prepared once per connection and reused from sqlite3's LRU cache
+    STATEMENT_CACHE_SIZE = 256
+    INSERT_SQL = "INSERT INTO predictions (features, prediction) VALUES (?, ?)"
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS {table} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            features BLOB NOT NULL,
+            prediction REAL NOT NULL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+    
+    def __init__(self, db_path: str, pool_size: int = 8):
         self.db_path = db_path
         self.init_db()
+        # SQLite in WAL mode allows many readers but a single writer
+        self.pool = ConnectionPool(self.get_connection, size=pool_size)
+        self.writer = self.get_connection()
+        self.write_lock = threading.Lock()
+    
+    def configure_connection(self, conn: sqlite3.Connection) -> sqlite3.Connection:
+        """Apply WAL mode and performance pragmas to a connection"""
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
     
     def init_db(self):
         """Initialize the database and create tables"""
         with sqlite3.connect(self.db_path, check_same_thread=False) as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS predictions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    features TEXT NOT NULL,
-                    prediction REAL NOT NULL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            self.configure_connection(conn)
+            conn.execute(self.SCHEMA.format(table="predictions"))
+            self.migrate_features_to_blob(conn)
             conn.commit()
     
+    def migrate_features_to_blob(self, conn: sqlite3.Connection):
+        """Rebuild a legacy table that stored features as comma-separated TEXT"""
+        columns = {row[1]: row[2] for row in conn.execute("PRAGMA table_info(predictions)")}
+        if columns.get("features", "").upper() != "TEXT":
+            return
+        
+        conn.execute(self.SCHEMA.format(table="predictions_new"))
+        rows = conn.execute("SELECT id, features, prediction, timestamp FROM predictions")
+        conn.executemany(
+            "INSERT INTO predictions_new (id, features, prediction, timestamp) VALUES (?, ?, ?, ?)",
+            (
+                (row_id, pack_features([float(x) for x in features.split(",")]), prediction, timestamp)
+                for row_id, features, prediction, timestamp in rows.fetchall()
+            )
+        )
+        conn.execute("DROP TABLE predictions")
+        conn.execute("ALTER TABLE predictions_new RENAME TO predictions")
+    
     def get_connection(self):
         """Get a database connection"""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        return self.configure_connection(
+            sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=self.STATEMENT_CACHE_SIZE
+            )
+        )
+    
+    @contextmanager
+    def reader(self):
+        """Borrow a pooled connection for read queries"""
+        conn = self.pool.get()
+        try:
+            yield conn
+        finally:
+            self.pool.put(conn)
+    
+    @contextmanager
+    def write_connection(self):
+        """Hold the single writer connection exclusively"""
+        with self.write_lock:
+            try:
+                yield self.writer
+            except Exception:
+                self.writer.rollback()
+                raise
+    
+    def insert_predictions(self, rows: List[tuple]):
+        """Insert many (features, prediction) rows in a single transaction"""
+        with self.write_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(self.INSERT_SQL, rows)
+            conn.commit()
+    
+    def close(self):
+        """Close the writer and all pooled connections"""
+        self.pool.close()
+        self.writer.close()
+
+
+class PredictionWriter:
+    """Coalesces concurrent prediction inserts into batched write transactions"""
+    
+    _STOP = None
+    
+    def __init__(self, db: DatabaseManager, max_batch: int = 256, max_delay: float = 0.0):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: asyncio.Queue = asyncio.Queue()
+    
+    def submit(self, features_blob: bytes, prediction: float) -> asyncio.Future:
+        """Queue a prediction row; the returned future resolves once it is committed"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((features_blob, prediction, future))
+        return future
+    
+    async def stop(self):
+        """Ask the writer to flush everything queued so far and exit"""
+        await self._queue.put(self._STOP)
+    
+    async def run(self):
+        """Drain the queue, writing up to max_batch rows per transaction"""
+        while True:
+            batch = [await self._queue.get()]
+            if self._queue.qsize() < self.max_batch - 1:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            
+            items = [item for item in batch if item is not self._STOP]
+            if items:
+                try:
+                    await asyncio.to_thread(
+                        self.db.insert_predictions,
+                        [(features_blob, prediction) for features_blob, prediction, _ in items]
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to write {len(items)} predictions: {str(e)}")
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for _, _, future in items:
+                        if not future.done():
+                            future.set_result(None)
+            
+            if len(items) != len(batch):
+                return
+
+
+class BufferedLogWriter:
+    """Append-only log file kept open for the process lifetime and flushed periodically"""
+    
+    def __init__(self, path: str, buffer_size: int = 1 << 16, flush_interval: float = 1.0):
+        self._file = open(path, "ab", buffering=buffer_size)
+        self._lock = threading.Lock()
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+    
+    def write(self, line: str):
+        """Buffer a line, flushing if the last flush is older than flush_interval"""
+        with self._lock:
+            self._file.write(line.encode("utf-8"))
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+    
+    def flush(self):
+        """Write any buffered lines to disk"""
+        with self._lock:
+            self._file.flush()
+            self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Flush and close the underlying file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
 
 
 # Global instances
 settings = Settings()
-db_manager = DatabaseManager(settings.db_path)
 
 # Logging configuration
+# Request handlers only enqueue records; a listener thread owns the file and stream I/O
+_log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+_log_handlers = [logging.FileHandler(settings.log_file), logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO if not settings.debug else logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(settings.log_file),
-        logging.StreamHandler()
-    ]
+    format="%(message)s",
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
 
 # Dependency injection
-def get_db_connection():
-    """Dependency to get database connection"""
-    conn = db_manager.get_connection()
-    try:
-        yield conn
-    finally:
-        conn.close()
+async def get_db(request: Request) -> DatabaseManager:
+    """Dependency to get the database manager created at startup"""
+    return request.app.state.db
+
+
+async def get_prediction_writer(request: Request) -> PredictionWriter:
+    """Dependency to get the prediction writer created at startup"""
+    return request.app.state.prediction_writer
 
 
 def get_settings():
@@ -109,24 +341,92 @@ def get_settings():
     return settings
 
 
+# Rows encoded per chunk while streaming /data
+STREAM_BATCH_SIZE = 500
+
+
+def _fetch_predictions(db: DatabaseManager, limit: int, before_id: Optional[int] = None) -> List[tuple]:
+    """Read a page of prediction rows, newest first (blocking; run in a worker thread)"""
+    # id is the rowid, so ordering and filtering on it is a range scan of the table B-tree
+    if before_id is None:
+        query = "SELECT id, features, prediction, timestamp FROM predictions ORDER BY id DESC LIMIT ?"
+        params = (limit,)
+    else:
+        query = "SELECT id, features, prediction, timestamp FROM predictions WHERE id < ? ORDER BY id DESC LIMIT ?"
+        params = (before_id, limit)
+    
+    # The page is bounded by limit, so read it whole and hand the connection straight back
+    with db.reader() as conn:
+        return conn.execute(query, params).fetchall()
+
+
+def _stream_predictions(rows: List[tuple]):
+    """Yield prediction rows as a JSON array encoded in batches"""
+    yield b"["
+    for start in range(0, len(rows), STREAM_BATCH_SIZE):
+        chunk = b",".join(
+            orjson.dumps({
+                "id": row[0],
+                "features": unpack_features(row[1]),
+                "prediction": row[2],
+                "timestamp": row[3]
+            })
+            for row in rows[start:start + STREAM_BATCH_SIZE]
+        )
+        yield (b"," + chunk) if start else chunk
+    yield b"]"
+    logger.info(f"Retrieved {len(rows)} predictions from database")
+
+
+# Background task log, opened once instead of per task
+background_log = BufferedLogWriter("background_tasks.log")
+atexit.register(background_log.close)
+
+
+# Strong references to in-flight background tasks so they are not garbage collected
+_background_tasks = set()
+
+
 # Background task function
-def log_message_task(message: str):
+async def log_message_task(message: str):
     """Background task to log a message after delay"""
-    time.sleep(5)  # 5 second delay
+    await asyncio.sleep(5)  # 5 second delay
     timestamp = datetime.now().isoformat()
     log_entry = f"{timestamp} - Background Task: {message}\n"
     
-    with open("background_tasks.log", "a") as f:
-        f.write(log_entry)
+    background_log.write(log_entry)
     
     logger.info(f"Background task completed: {message}")
 
 
+def open_database() -> DatabaseManager:
+    """Open the database, letting only one worker process create or migrate the schema at a time"""
+    with FileLock(settings.db_path + ".initlock"):
+        return DatabaseManager(settings.db_path, pool_size=settings.db_pool_size)
+
+
 # Lifespan context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting up ML Model Serving API")
+    db_manager = await asyncio.to_thread(open_database)
+    prediction_writer = PredictionWriter(
+        db_manager,
+        max_batch=settings.write_batch_size,
+        max_delay=settings.write_batch_delay_ms / 1000
+    )
+    app.state.db = db_manager
+    app.state.prediction_writer = prediction_writer
+    writer_task = asyncio.create_task(prediction_writer.run())
     yield
+    # Let queued background tasks finish writing their log entries before the log is flushed
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
+    # Flush any predictions still waiting to be written
+    await prediction_writer.stop()
+    await writer_task
+    db_manager.close()
+    background_log.flush()
     logger.info("Shutting down ML Model Serving API")
 
 
@@ -135,55 +435,45 @@ app = FastAPI(
     title=settings.app_name,
     description="Advanced ML Model Serving API with SQLite database and background tasks",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 
 # Custom exception handler
 @app.exception_handler(PredictionError)
 async def prediction_error_handler(request: Request, exc: PredictionError):
-    from fastapi.responses import JSONResponse
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=400,
         content={"error": "Prediction Error", "message": exc.message}
     )
 
 
 # API Routes
-@app.get("/health", response_model=HealthResponse)
+_HEALTH_BYTES = b'{"status":"ok"}'
+
+
+@app.get("/health", responses={200: {"model": HealthResponse}})
 async def health_check():
     """Health check endpoint"""
-    logger.info("Health check requested")
-    return HealthResponse(status="ok")
+    logger.debug("Health check requested")
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
-@app.post("/predict", response_model=PredictionResponse)
+@app.post("/predict", responses={200: {"model": PredictionResponse}})
 async def predict(
     request: PredictionRequest,
-    conn: sqlite3.Connection = Depends(get_db_connection)
+    prediction_writer: PredictionWriter = Depends(get_prediction_writer)
 ):
     """Prediction endpoint with database logging"""
     try:
-        if not request.features:
-            raise PredictionError("Features list cannot be empty")
-        
-        if any(not isinstance(x, (int, float)) for x in request.features):
-            raise PredictionError("All features must be numeric")
-        
-        # Simple prediction: sum of features
-        prediction = sum(request.features)
+        prediction = compute_prediction(request.features)
         
         # Log prediction to database
-        features_str = ",".join(map(str, request.features))
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO predictions (features, prediction) VALUES (?, ?)",
-            (features_str, prediction)
-        )
-        conn.commit()
+        await prediction_writer.submit(pack_features(request.features), prediction)
         
-        logger.info(f"Prediction made: {prediction} for features: {request.features}")
-        return PredictionResponse(prediction=prediction)
+        logger.debug("Prediction made: %s for %d features", prediction, len(request.features))
+        return {"prediction": prediction}
         
     except Exception as e:
         if isinstance(e, PredictionError):
@@ -205,41 +495,29 @@ async def train_model():
 
 
 @app.get("/data")
-async def get_predictions(conn: sqlite3.Connection = Depends(get_db_connection)):
-    """Retrieve all predictions from database"""
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, features, prediction, timestamp FROM predictions ORDER BY timestamp DESC")
-    rows = cursor.fetchall()
-    
-    predictions = []
-    for row in rows:
-        predictions.append({
-            "id": row[0],
-            "features": [float(x) for x in row[1].split(",")],
-            "prediction": row[2],
-            "timestamp": row[3]
-        })
-    
-    logger.info(f"Retrieved {len(predictions)} predictions from database")
-    return predictions
-
-
-@app.post("/background_task", response_model=TaskResponse)
-async def create_background_task(
-    request: BackgroundTaskRequest,
-    background_tasks: BackgroundTasks
+async def get_predictions(
+    limit: int = Query(100, ge=1, le=10000),
+    before_id: Optional[int] = None,
+    db: DatabaseManager = Depends(get_db)
 ):
+    """Retrieve predictions newest first; pass the last id seen as before_id for the next page"""
+    # Query before the response starts so database errors still surface as a 500
+    rows = await asyncio.to_thread(_fetch_predictions, db, limit, before_id)
+    return StreamingResponse(_stream_predictions(rows), media_type="application/json")
+
+
+@app.post("/background_task", responses={200: {"model": TaskResponse}})
+async def create_background_task(request: BackgroundTaskRequest):
     """Create a background task to log a message"""
-    background_tasks.add_task(log_message_task, request.message)
+    task = asyncio.create_task(log_message_task(request.message))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
     logger.info(f"Background task queued for message: {request.message}")
-    return TaskResponse(status="task started")
+    return {"status": "task started"}
 
 
-# Web UI endpoint
-@app.get("/", response_class=HTMLResponse)
-async def get_web_ui():
-    """Serve the web UI"""
-    html_content = """
+# Web UI page, encoded once at import time
+_INDEX_HTML = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -635,14 +913,80 @@ async def get_web_ui():
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+INDEX_HTML_BYTES = _INDEX_HTML.encode("utf-8")
+INDEX_GZ = gzip.compress(INDEX_HTML_BYTES, 9)
+INDEX_BR = brotli.compress(INDEX_HTML_BYTES, quality=11) if brotli else None
+
+
+def _index_headers(body: bytes, encoding: str = None) -> Dict[str, str]:
+    """Build the cached response headers for one encoding of the index page"""
+    headers = {
+        "content-length": str(len(body)),
+        "cache-control": "public, max-age=3600",
+        "vary": "Accept-Encoding"
+    }
+    if encoding:
+        headers["content-encoding"] = encoding
+    return headers
+
+
+_INDEX_HEADERS = _index_headers(INDEX_HTML_BYTES)
+_INDEX_GZ_HEADERS = _index_headers(INDEX_GZ, "gzip")
+_INDEX_BR_HEADERS = _index_headers(INDEX_BR, "br") if INDEX_BR else None
+
+
+def _accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows the given coding (q=0 means refused)"""
+    wildcard_q = None
+    for token in accept_encoding.split(","):
+        coding, _, params = token.partition(";")
+        coding = coding.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding == encoding:
+            return q > 0
+        if coding == "*":
+            wildcard_q = q
+    return wildcard_q is not None and wildcard_q > 0
+
+
+# Web UI endpoint
+@app.get("/", response_class=HTMLResponse)
+async def get_web_ui(request: Request):
+    """Serve the web UI, precompressed when the client accepts it"""
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if INDEX_BR and _accepts_encoding(accept_encoding, "br"):
+        return Response(content=INDEX_BR, media_type="text/html", headers=_INDEX_BR_HEADERS)
+    if _accepts_encoding(accept_encoding, "gzip"):
+        return Response(content=INDEX_GZ, media_type="text/html", headers=_INDEX_GZ_HEADERS)
+    return Response(content=INDEX_HTML_BYTES, media_type="text/html", headers=_INDEX_HEADERS)
 
 
 if __name__ == "__main__":
+    # Auto-reload is opt-in via --dev; otherwise run the multi-worker production config
+    dev_mode = "--dev" in sys.argv[1:]
+    
+    try:
+        import uvloop
+        uvloop.install()
+        loop = "uvloop"
+    except ImportError:  # uvloop is unavailable on Windows
+        loop = "asyncio"
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=settings.debug,
-        log_level="info"
+        reload=dev_mode,
+        loop=loop,
+        http="httptools",
+        access_log=dev_mode,
+        workers=1 if dev_mode else os.cpu_count(),
+        log_level="info" if dev_mode else "warning"
     )
\ No newline at end of file
@@ -1,20 +1,36 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
+from starlette.datastructures import MutableHeaders
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from .routers import health, api, web
+from .utils import iso_now, ERROR_SIMULATION_ENABLED
+import atexit
+import collections
 import os
+import queue
+import random
 import time
 import logging
+import logging.handlers
 import traceback
-from datetime import datetime
+import orjson
 
 # Configure comprehensive logging
+# Request handlers only enqueue records; a listener thread owns the stream I/O
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(message)s',
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
 logger = logging.getLogger(__name__)
 
@@ -24,58 +40,95 @@ app = FastAPI(
     description="A comprehensive FastAPI application with OpenTelemetry auto-instrumentation and error simulation capabilities for Dynatrace testing",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Mount static files
 try:
     app.mount("/static", StaticFiles(directory="app/static"), name="static")
 except Exception as e:
-    logger.error(f"Failed to mount static files: {str(e)}")
+    logger.error("Failed to mount static files: %s", e)
 
 # Global error tracking
-error_tracker = {
-    "total_errors": 0,
-    "error_types": {},
-    "last_error": None,
-    "error_rate": 0.0
-}
+class _Tracker:
+    """Error statistics for this worker.
+    
+    Only mutated from the event loop thread and never across an await, so
+    updates need no lock; readers take a copy via snapshot().
+    """
+    __slots__ = ("total_errors", "error_types", "last_error", "startup_time")
+    
+    def __init__(self):
+        self.startup_time = None
+        self.reset()
+    
+    def reset(self):
+        self.total_errors = 0
+        self.error_types = collections.Counter()
+        self.last_error = None
+    
+    def snapshot(self):
+        return self.total_errors, dict(self.error_types), self.last_error
+
+error_tracker = _Tracker()
+
+# Error type keys for the common status codes, built once instead of per error
+_TRACKED_STATUS_CODES = (400, 401, 403, 404, 405, 409, 422, 429, 500, 502, 503, 504)
+_HTTP_KEYS = {code: f"HTTP_{code}" for code in _TRACKED_STATUS_CODES}
+_STARLETTE_HTTP_KEYS = {code: f"STARLETTE_HTTP_{code}" for code in _TRACKED_STATUS_CODES}
+
+def _record(error_type, last_error=None):
+    """Count one error of the given type, optionally remembering it as the last error"""
+    error_tracker.total_errors += 1
+    error_tracker.error_types[error_type] += 1
+    if last_error is not None:
+        error_tracker.last_error = last_error
+
+# Static assets and API docs are passed straight through, untracked
+_UNTRACKED_PREFIXES = ("/static", "/api/docs", "/api/redoc")
 
 # Request tracking middleware with error handling
-@app.middleware("http")
-async def comprehensive_request_middleware(request: Request, call_next):
-    """Enhanced middleware with error tracking and request monitoring"""
-    start_time = time.time()
+class RequestTrackingMiddleware:
+    """Pure ASGI middleware with error tracking and request monitoring"""
     
-    try:
-        # Process request
-        response = await call_next(request)
-        
-        # Update request counter
-        from .routers import health
-        health.request_count += 1
-        
-        # Calculate response time
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(_UNTRACKED_PREFIXES):
+            await self.app(scope, receive, send)
+            return
         
-        return response
+        start_ns = time.perf_counter_ns()
         
-    except Exception as e:
-        # Track errors
-        error_tracker["total_errors"] += 1
-        error_tracker["last_error"] = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "error": str(e),
-            "path": str(request.url),
-            "method": request.method
-        }
+        async def send_with_process_time(message):
+            if message["type"] == "http.response.start":
+                # Calculate response time
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                MutableHeaders(scope=message).append("X-Process-Time", f"{elapsed_ns * 1e-9:.6f}")
+            await send(message)
         
-        error_type = type(e).__name__
-        error_tracker["error_types"][error_type] = error_tracker["error_types"].get(error_type, 0) + 1
+        try:
+            # Process request
+            await self.app(scope, receive, send_with_process_time)
+        except Exception as e:
+            # Track errors
+            request = Request(scope)
+            _record(type(e).__name__, {
+                "timestamp": iso_now(),
+                "error": str(e),
+                "path": str(request.url),
+                "method": request.method
+            })
+            
+            # Re-raise the exception to be handled by exception handlers
+            raise
         
-        # Re-raise the exception to be handled by exception handlers
-        raise e
+        # Update request counter
+        health.count_request()
+
+app.add_middleware(RequestTrackingMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -86,46 +139,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Byte template for the HTTPException envelope; only detail and path need JSON escaping
+_HTTP_ERROR_TEMPLATE = b'{"error":"HTTP %d","detail":%b,"timestamp":"%b","path":%b,"method":"%b","request_id":%d}'
+
 # Comprehensive Exception Handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with detailed logging"""
-    error_tracker["total_errors"] += 1
-    error_type = f"HTTP_{exc.status_code}"
-    error_tracker["error_types"][error_type] = error_tracker["error_types"].get(error_type, 0) + 1
+    sc = exc.status_code
+    url = str(request.url)
+    _record(_HTTP_KEYS.get(sc) or f"HTTP_{sc}")
     
     # Log the HTTP exception
-    logger.error(f"HTTP Exception {exc.status_code}: {exc.detail} - Path: {request.url}")
+    logger.error("HTTP Exception %s: %s - Path: %s", sc, exc.detail, url)
     
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "error": f"HTTP {exc.status_code}",
-            "detail": exc.detail,
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": str(request.url),
-            "method": request.method,
-            "request_id": id(request)
-        },
+    body = _HTTP_ERROR_TEMPLATE % (
+        sc,
+        orjson.dumps(exc.detail),
+        iso_now().encode(),
+        orjson.dumps(url),
+        request.method.encode(),
+        id(request)
+    )
+    return Response(
+        content=body,
+        status_code=sc,
+        media_type="application/json",
         headers=getattr(exc, 'headers', None)
     )
 
 @app.exception_handler(StarletteHTTPException)
 async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle Starlette HTTP exceptions"""
-    error_tracker["total_errors"] += 1
-    error_type = f"STARLETTE_HTTP_{exc.status_code}"
-    error_tracker["error_types"][error_type] = error_tracker["error_types"].get(error_type, 0) + 1
+    sc = exc.status_code
+    url = str(request.url)
+    _record(_STARLETTE_HTTP_KEYS.get(sc) or f"STARLETTE_HTTP_{sc}")
     
-    logger.error(f"Starlette HTTP Exception {exc.status_code}: {exc.detail} - Path: {request.url}")
+    logger.error("Starlette HTTP Exception %s: %s - Path: %s", sc, exc.detail, url)
     
-    return JSONResponse(
-        status_code=exc.status_code,
+    return ORJSONResponse(
+        status_code=sc,
         content={
-            "error": f"HTTP {exc.status_code}",
+            "error": f"HTTP {sc}",
             "detail": exc.detail,
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": str(request.url),
+            "timestamp": iso_now(),
+            "path": url,
             "type": "starlette_http_exception"
         }
     )
@@ -133,19 +191,19 @@ async def starlette_http_exception_handler(request: Request, exc: StarletteHTTPE
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors"""
-    error_tracker["total_errors"] += 1
-    error_tracker["error_types"]["VALIDATION_ERROR"] = error_tracker["error_types"].get("VALIDATION_ERROR", 0) + 1
+    url = str(request.url)
+    _record("VALIDATION_ERROR")
     
-    logger.error(f"Validation Error: {str(exc)} - Path: {request.url}")
+    logger.error("Validation Error: %s - Path: %s", exc, url)
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "error": "Validation Error",
             "detail": "Request validation failed",
             "errors": exc.errors(),
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": str(request.url),
+            "timestamp": iso_now(),
+            "path": url,
             "body": str(exc.body) if hasattr(exc, 'body') else None
         }
     )
@@ -153,23 +211,24 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle all other exceptions"""
-    error_tracker["total_errors"] += 1
-    error_type = type(exc).__name__
-    error_tracker["error_types"][error_type] = error_tracker["error_types"].get(error_type, 0) + 1
+    etype = type(exc).__name__
+    url = str(request.url)
+    _record(etype)
     
     # Log the full exception with traceback
-    logger.critical(f"Unhandled Exception: {str(exc)} - Path: {request.url}")
-    logger.critical(f"Exception type: {type(exc).__name__}")
-    logger.critical(f"Traceback: {traceback.format_exc()}")
+    logger.critical("Unhandled Exception: %s - Path: %s", exc, url)
+    logger.critical("Exception type: %s", etype)
+    if logger.isEnabledFor(logging.CRITICAL):
+        logger.critical("Traceback: %s", traceback.format_exc())
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal Server Error",
             "detail": "An unexpected error occurred",
-            "exception_type": type(exc).__name__,
-            "timestamp": datetime.utcnow().isoformat(),
-            "path": str(request.url),
+            "exception_type": etype,
+            "timestamp": iso_now(),
+            "path": url,
             "method": request.method,
             "error_id": f"ERR_{int(time.time())}"
         }
@@ -180,58 +239,48 @@ try:
     app.include_router(health.router, prefix="/api", tags=["Health"])
     logger.info("Health router included successfully")
 except Exception as e:
-    logger.error(f"Failed to include health router: {str(e)}")
+    logger.error("Failed to include health router: %s", e)
 
 try:
     app.include_router(api.router, prefix="/api", tags=["API"])
     logger.info("API router included successfully")
 except Exception as e:
-    logger.error(f"Failed to include API router: {str(e)}")
+    logger.error("Failed to include API router: %s", e)
 
 try:
     app.include_router(web.router, tags=["Web UI"])
     logger.info("Web router included successfully")
 except Exception as e:
-    logger.error(f"Failed to include web router: {str(e)}")
+    logger.error("Failed to include web router: %s", e)
 
 # Additional error tracking endpoints
 @app.get("/api/error-tracking")
 async def get_error_tracking():
     """Get comprehensive error tracking information"""
-    # Try to get request count from health router, fallback to 0
-    try:
-        from .routers import health
-        total_requests = getattr(health, 'request_count', 0)
-    except:
-        total_requests = 1  # Avoid division by zero
+    total_requests = health.get_request_count()
+    total_errors, error_types, last_error = error_tracker.snapshot()
     
-    error_rate = (error_tracker["total_errors"] / max(total_requests, 1)) * 100
+    error_rate = (total_errors / max(total_requests, 1)) * 100
     
     return {
-        "total_errors": error_tracker["total_errors"],
+        "total_errors": total_errors,
         "total_requests": total_requests,
         "error_rate_percent": round(error_rate, 2),
-        "error_types": error_tracker["error_types"],
-        "last_error": error_tracker["last_error"],
-        "timestamp": datetime.utcnow().isoformat()
+        "error_types": error_types,
+        "last_error": last_error,
+        "timestamp": iso_now()
     }
 
 
 @app.post("/api/clear-error-tracking")
 async def clear_error_tracking():
     """Clear error tracking statistics"""
-    global error_tracker
-    error_tracker = {
-        "total_errors": 0,
-        "error_types": {},
-        "last_error": None,
-        "error_rate": 0.0
-    }
+    error_tracker.reset()
     
     logger.info("Error tracking statistics cleared")
     return {
         "message": "Error tracking statistics cleared",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 # Startup and shutdown events
@@ -247,15 +296,19 @@ async def startup_event():
         logger.info(f"📈 Dynatrace monitoring capabilities active")
         
         # Initialize error tracking
-        error_tracker["startup_time"] = datetime.utcnow().isoformat()
+        error_tracker.startup_time = iso_now()
+        
+        # Sample system stats in the background instead of per request
+        health.start_system_sampler()
         
         # Log environment information
         logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
         logger.info(f"Debug mode: {os.getenv('DEBUG', 'False')}")
         
     except Exception as e:
-        logger.critical(f"Startup failed: {str(e)}")
-        logger.critical(f"Startup traceback: {traceback.format_exc()}")
+        logger.critical("Startup failed: %s", e)
+        if logger.isEnabledFor(logging.CRITICAL):
+            logger.critical("Startup traceback: %s", traceback.format_exc())
         raise e
 
 @app.on_event("shutdown")
@@ -263,51 +316,70 @@ async def shutdown_event():
     """Application shutdown with cleanup"""
     try:
         logger.info("🛑 FastAPI application shutting down...")
-        logger.info(f"Total errors during runtime: {error_tracker['total_errors']}")
-        logger.info(f"Error types: {error_tracker['error_types']}")
+        await health.stop_system_sampler()
+        logger.info(f"Total errors during runtime: {error_tracker.total_errors}")
+        logger.info(f"Error types: {dict(error_tracker.error_types)}")
         logger.info("Application shutdown completed successfully")
         
     except Exception as e:
-        logger.error(f"Error during shutdown: {str(e)}")
+        logger.error("Error during shutdown: %s", e)
+
+# Pre-encoded pieces of the constant responses; only the ping timestamp varies.
+# Responses are still built per request because middleware appends to their headers.
+_PING_PREFIX = b'{"message":"pong","timestamp":"'
+_PING_SUFFIX = b'","status":"ok"}'
+_ROOT_REDIRECT_HEADERS = {"location": "/"}
 
 # Health check for the entire application
 @app.get("/ping")
 async def ping():
     """Simple ping endpoint for basic connectivity testing"""
-    return {
-        "message": "pong",
-        "timestamp": datetime.utcnow().isoformat(),
-        "status": "ok"
-    }
+    return Response(
+        content=_PING_PREFIX + iso_now().encode() + _PING_SUFFIX,
+        media_type="application/json"
+    )
 
 # Root endpoint with error simulation
 @app.get("/")
 async def root():
     """Root endpoint that redirects to dashboard"""
     # Random chance of root endpoint failure for testing
-    import random
-    if random.random() < 0.01:  # 1% chance
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.01:  # 1% chance
         logger.error("Root endpoint random failure for testing")
         raise HTTPException(
             status_code=503,
             detail="Service temporarily unavailable at root"
         )
     
-    from fastapi.responses import RedirectResponse
-    return RedirectResponse(url="/", status_code=302)
+    return Response(status_code=302, headers=_ROOT_REDIRECT_HEADERS)
 
 if __name__ == "__main__":
     import uvicorn
     
+    # uvloop and httptools ship with uvicorn[standard] but are missing on Windows and slim installs
+    try:
+        import uvloop
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    try:
+        import httptools
+        http = "httptools"
+    except ImportError:
+        http = "auto"
+    
     try:
         logger.info("Starting server with uvicorn...")
         uvicorn.run(
-            app, 
+            "app.main:app",
             host="0.0.0.0", 
             port=8000,
             log_level="info",
-            access_log=True
+            access_log=True,
+            loop=loop,
+            http=http,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1"))
         )
     except Exception as e:
-        logger.critical(f"Failed to start server: {str(e)}")
+        logger.critical("Failed to start server: %s", e)
         raise e
\ No newline at end of file
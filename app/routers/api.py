@@ -4,6 +4,7 @@ from typing import List, Optional
 from datetime import datetime
 import random
 import asyncio
+import itertools
 import time
 import logging
 from ..models import UserRequest, UserResponse
@@ -11,12 +12,18 @@ from ..models import UserRequest, UserResponse
 router = APIRouter()
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Simple in-memory storage
 users_db = []
 
+# Ids are never reused, so they stay unique after deletions and across awaits
+_user_ids = itertools.count(1)
+
+def next_user_id() -> int:
+    """Allocate the id for a new user"""
+    return next(_user_ids)
+
 # Custom exceptions for application errors
 class DatabaseConnectionError(Exception):
     """Simulates database connection issues"""
@@ -40,9 +47,21 @@ error_simulation = {
     "validation_errors": False,
     "service_errors": False,
     "rate_limit_errors": False,
-    "random_errors": False
+    "random_errors": False,
+    "simulate_latency": False
 }
 
+# Error types accepted by /error-simulation/enable
+_AVAILABLE_ERROR_TYPES = (
+    "database_errors",
+    "validation_errors",
+    "service_errors",
+    "rate_limit_errors",
+    "random_errors",
+    "simulate_latency"
+)
+_VALID_ERROR_TYPES = frozenset(_AVAILABLE_ERROR_TYPES)
+
 @router.get("/")
 async def root():
     """Root endpoint with potential errors"""
@@ -105,11 +124,12 @@ async def create_user(user: UserRequest, request: Request):
         )
     
     try:
-        # Simulate processing delay
-        await asyncio.sleep(random.uniform(0.1, 0.3))
+        # Simulate processing delay; opt-in only, it capped create throughput at a few req/s
+        if error_simulation.get("simulate_latency"):
+            await asyncio.sleep(random.uniform(0.1, 0.3))
         
         new_user = UserResponse(
-            id=len(users_db) + 1,
+            id=next_user_id(),
             name=user.name,
             email=user.email,
             age=user.age,
@@ -311,13 +331,8 @@ async def enable_error_simulation(error_types: dict):
     """Enable specific error types for testing"""
     global error_simulation
     
-    valid_types = {
-        "database_errors", "validation_errors", 
-        "service_errors", "rate_limit_errors", "random_errors"
-    }
-    
     for error_type, enabled in error_types.items():
-        if error_type in valid_types:
+        if error_type in _VALID_ERROR_TYPES:
             error_simulation[error_type] = enabled
             logger.info(f"Error simulation {error_type}: {'enabled' if enabled else 'disabled'}")
         else:
@@ -336,40 +351,35 @@ async def get_error_simulation_status():
     """Get current error simulation settings"""
     return {
         "error_simulation_status": error_simulation,
-        "available_error_types": [
-            "database_errors",
-            "validation_errors", 
-            "service_errors",
-            "rate_limit_errors",
-            "random_errors"
-        ]
+        "available_error_types": _AVAILABLE_ERROR_TYPES
     }
 
+# Default detail for each status code /trigger-error can raise
+_ERROR_MESSAGES = {
+    400: "Bad Request - Invalid input provided",
+    401: "Unauthorized - Authentication required",
+    403: "Forbidden - Access denied",
+    404: "Not Found - Resource does not exist", 
+    409: "Conflict - Resource already exists",
+    422: "Unprocessable Entity - Validation failed",
+    429: "Too Many Requests - Rate limit exceeded",
+    500: "Internal Server Error - Server encountered an error",
+    502: "Bad Gateway - Upstream server error",
+    503: "Service Unavailable - Service temporarily down",
+    504: "Gateway Timeout - Upstream server timeout"
+}
+
 @router.post("/trigger-error/{error_code}")
 async def trigger_specific_error(error_code: int, message: Optional[str] = None):
     """Manually trigger specific HTTP error codes"""
     
-    error_messages = {
-        400: "Bad Request - Invalid input provided",
-        401: "Unauthorized - Authentication required",
-        403: "Forbidden - Access denied",
-        404: "Not Found - Resource does not exist", 
-        409: "Conflict - Resource already exists",
-        422: "Unprocessable Entity - Validation failed",
-        429: "Too Many Requests - Rate limit exceeded",
-        500: "Internal Server Error - Server encountered an error",
-        502: "Bad Gateway - Upstream server error",
-        503: "Service Unavailable - Service temporarily down",
-        504: "Gateway Timeout - Upstream server timeout"
-    }
-    
-    if error_code not in error_messages:
+    if error_code not in _ERROR_MESSAGES:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported error code: {error_code}"
         )
     
-    error_detail = message or error_messages[error_code]
+    error_detail = message or _ERROR_MESSAGES[error_code]
     logger.error(f"Manually triggered error {error_code}: {error_detail}")
     
     # Add retry-after header for 429 and 503
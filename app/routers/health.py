@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from datetime import datetime
 import asyncio
+import itertools
 import time
 import psutil
 import os
@@ -10,17 +11,86 @@ import logging
 import requests
 from typing import Dict, Any
 from ..models import HealthResponse, MetricsResponse
+from ..utils import iso_now, ERROR_SIMULATION_ENABLED
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# The worker's PID never changes, so build the psutil handle once
+_PROC = psutil.Process(os.getpid())
+
+# Prime psutil's CPU delta so later interval=None calls return real values
+psutil.cpu_percent(interval=None)
+
+# System stats sampled off the event loop; endpoints read this snapshot
+SYS_SAMPLE_INTERVAL = 2.0
+_sys_snapshot: Dict[str, Any] = {}
+_sys_sampler_task = None
+
+def _collect_system_stats() -> Dict[str, Any]:
+    """Read the /proc-backed stats used by the health and metrics endpoints"""
+    return {
+        "memory": psutil.virtual_memory(),
+        "disk": psutil.disk_usage('/'),
+        "connections": len(_PROC.connections()),
+        "rss": _PROC.memory_info().rss
+    }
+
+def get_system_snapshot() -> Dict[str, Any]:
+    """Return the latest system stats, collecting inline if the sampler hasn't run yet"""
+    if not _sys_snapshot:
+        _sys_snapshot.update(_collect_system_stats())
+    return _sys_snapshot
+
+async def _sys_sampler():
+    while True:
+        try:
+            _sys_snapshot.update(await asyncio.to_thread(_collect_system_stats))
+        except psutil.Error as e:
+            logger.error(f"System stats sampling failed: {str(e)}")
+        await asyncio.sleep(SYS_SAMPLE_INTERVAL)
+
+def start_system_sampler():
+    """Start the background system stats sampler"""
+    global _sys_sampler_task
+    if _sys_sampler_task is None or _sys_sampler_task.done():
+        _sys_sampler_task = asyncio.create_task(_sys_sampler())
+
+async def stop_system_sampler():
+    """Stop the background system stats sampler"""
+    global _sys_sampler_task
+    if _sys_sampler_task is not None:
+        _sys_sampler_task.cancel()
+        try:
+            await _sys_sampler_task
+        except asyncio.CancelledError:
+            pass
+        _sys_sampler_task = None
+
 start_time = time.time()
-request_count = 0
+_start_ns = time.monotonic_ns()
+
+def uptime_seconds() -> float:
+    """Seconds since this worker imported the health router, unaffected by clock changes"""
+    return (time.monotonic_ns() - _start_ns) * 1e-9
 health_check_failures = 0
 
+# Request counter: itertools.count does the increment in C, _last_request_count
+# holds the most recent value so it can be read without consuming a tick
+_request_counter = itertools.count(1)
+_last_request_count = [0]
+
+def count_request() -> int:
+    """Record one request and return the new total"""
+    _last_request_count[0] = value = next(_request_counter)
+    return value
+
+def get_request_count() -> int:
+    """Return the number of requests recorded so far"""
+    return _last_request_count[0]
+
 # Health status simulation
 health_status = {
     "database": "healthy",
@@ -30,6 +100,16 @@ health_status = {
     "memory": "healthy"
 }
 
+# Simulation types accepted by /health-simulation/enable
+_AVAILABLE_SIM_TYPES = (
+    "intermittent_failures",
+    "memory_pressure",
+    "disk_pressure",
+    "slow_responses",
+    "cascade_failures"
+)
+_VALID_SIM_TYPES = frozenset(_AVAILABLE_SIM_TYPES)
+
 # Error simulation settings
 health_simulation = {
     "intermittent_failures": False,
@@ -42,8 +122,8 @@ health_simulation = {
 @router.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check(request: Request):
     """Enhanced health check with comprehensive error simulation"""
-    global health_check_failures, request_count
-    request_count += 1
+    global health_check_failures
+    count_request()
     
     # Simulate slow responses
     if health_simulation.get("slow_responses") and random.random() < 0.3:
@@ -77,11 +157,11 @@ async def health_check(request: Request):
         
         if not system_health["healthy"]:
             logger.error(f"System health degraded: {system_health['issues']}")
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=503,
                 content={
                     "status": "degraded",
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": iso_now(),
                     "version": "1.0.0",
                     "issues": system_health["issues"],
                     "checks": system_health["checks"]
@@ -89,13 +169,13 @@ async def health_check(request: Request):
             )
         
         # Random chance of reporting degraded status even when healthy
-        if random.random() < 0.05:  # 5% chance
+        if ERROR_SIMULATION_ENABLED and random.random() < 0.05:  # 5% chance
             logger.warning("Reporting degraded status for testing")
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=503,
                 content={
                     "status": "degraded", 
-                    "timestamp": datetime.utcnow().isoformat(),
+                    "timestamp": iso_now(),
                     "version": "1.0.0",
                     "message": "System experiencing intermittent issues"
                 }
@@ -121,8 +201,10 @@ async def check_system_health():
     checks = {}
     
     try:
+        snapshot = get_system_snapshot()
+        
         # Memory check with simulation
-        memory = psutil.virtual_memory()
+        memory = snapshot["memory"]
         memory_threshold = 85.0  # Normal threshold
         
         if health_simulation.get("memory_pressure"):
@@ -138,7 +220,7 @@ async def check_system_health():
         }
         
         # Disk check with simulation  
-        disk = psutil.disk_usage('/')
+        disk = snapshot["disk"]
         disk_threshold = 90.0  # Normal threshold
         
         if health_simulation.get("disk_pressure"):
@@ -154,8 +236,8 @@ async def check_system_health():
             "threshold": disk_threshold
         }
         
-        # CPU check
-        cpu_percent = psutil.cpu_percent(interval=1)
+        # CPU check (non-blocking: usage since the previous call)
+        cpu_percent = psutil.cpu_percent(interval=None)
         if cpu_percent > 80.0:
             issues.append(f"High CPU usage: {cpu_percent:.1f}%")
             
@@ -176,7 +258,7 @@ async def check_system_health():
             checks["external_service"] = {"status": "healthy"}
         
         # Database simulation
-        if random.random() < 0.05:  # 5% chance of DB issues
+        if ERROR_SIMULATION_ENABLED and random.random() < 0.05:  # 5% chance of DB issues
             issues.append("Database connection pool exhausted")
             checks["database"] = {
                 "status": "degraded",
@@ -205,7 +287,7 @@ async def deep_health_check():
     """Comprehensive health check with detailed component status"""
     
     # Simulate various failure scenarios
-    if random.random() < 0.1:  # 10% chance
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.1:  # 10% chance
         logger.error("Deep health check failed")
         raise HTTPException(
             status_code=503,
@@ -231,14 +313,14 @@ async def deep_health_check():
         
         response_data = {
             "status": overall_status,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_now(),
             "services": services,
             "failed_services": failed_services,
             "total_checks": len(services),
             "passed_checks": len(services) - len(failed_services)
         }
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status_code,
             content=response_data
         )
@@ -258,7 +340,7 @@ async def simulate_database_check():
             "error": "Connection timeout after 5000ms",
             "last_successful_connection": "2024-01-15T10:30:00Z"
         }
-    elif random.random() < 0.1:
+    elif ERROR_SIMULATION_ENABLED and random.random() < 0.1:
         return {
             "status": "degraded", 
             "warning": "High connection pool usage",
@@ -276,7 +358,7 @@ async def simulate_database_check():
 
 async def simulate_cache_check():
     """Simulate cache service health check"""
-    if random.random() < 0.08:
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.08:
         return {
             "status": "failed",
             "error": "Redis connection refused",
@@ -292,7 +374,7 @@ async def simulate_cache_check():
 
 async def simulate_message_queue_check():
     """Simulate message queue health check"""
-    if random.random() < 0.05:
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.05:
         return {
             "status": "degraded",
             "warning": "High queue depth",
@@ -308,7 +390,7 @@ async def simulate_message_queue_check():
 
 async def simulate_external_api_check():
     """Simulate external API dependency check"""
-    if random.random() < 0.12:
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.12:
         return {
             "status": "failed",
             "error": "HTTP 503 Service Unavailable",
@@ -333,7 +415,7 @@ async def simulate_filesystem_check():
             "usage_percent": 97.9
         }
     
-    disk = psutil.disk_usage('/')
+    disk = get_system_snapshot()["disk"]
     return {
         "status": "healthy",
         "available_gb": round(disk.free / (1024**3), 1),
@@ -344,11 +426,10 @@ async def simulate_filesystem_check():
 @router.get("/metrics", response_model=MetricsResponse, tags=["Monitoring"])
 async def get_metrics():
     """Enhanced metrics with error simulation"""
-    global request_count
-    request_count += 1
+    count_request()
     
     # Simulate metrics collection failures
-    if random.random() < 0.05:  # 5% chance
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.05:  # 5% chance
         logger.error("Metrics collection failed")
         raise HTTPException(
             status_code=503,
@@ -356,24 +437,24 @@ async def get_metrics():
         )
     
     try:
-        process = psutil.Process(os.getpid())
-        memory_info = process.memory_info()
+        snapshot = get_system_snapshot()
+        memory_usage_mb = snapshot["rss"] / (1024 * 1024)
         
         # Simulate corrupted metrics occasionally
-        if random.random() < 0.03:
+        if ERROR_SIMULATION_ENABLED and random.random() < 0.03:
             logger.warning("Returning potentially corrupted metrics")
             return MetricsResponse(
                 total_requests=-1,  # Invalid value
-                active_connections=process.connections().__len__(),
-                uptime_seconds=time.time() - start_time,
-                memory_usage_mb=memory_info.rss / (1024 * 1024)
+                active_connections=snapshot["connections"],
+                uptime_seconds=uptime_seconds(),
+                memory_usage_mb=memory_usage_mb
             )
         
         return MetricsResponse(
-            total_requests=request_count,
-            active_connections=len(process.connections()),
-            uptime_seconds=time.time() - start_time,
-            memory_usage_mb=memory_info.rss / (1024 * 1024)
+            total_requests=get_request_count(),
+            active_connections=snapshot["connections"],
+            uptime_seconds=uptime_seconds(),
+            memory_usage_mb=memory_usage_mb
         )
         
     except psutil.Error as e:
@@ -394,7 +475,7 @@ async def readiness_check():
     """Readiness check that can fail independently from health"""
     
     # Simulate readiness failures (different from health)
-    if random.random() < 0.08:  # 8% chance
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.08:  # 8% chance
         logger.warning("Service not ready")
         raise HTTPException(
             status_code=503,
@@ -403,20 +484,20 @@ async def readiness_check():
     
     # Check if service dependencies are ready
     dependencies_ready = {
-        "database_migration": random.choice([True, True, True, False]),
+        "database_migration": not ERROR_SIMULATION_ENABLED or random.choice([True, True, True, False]),
         "config_loaded": True,
-        "cache_warmed": random.choice([True, True, False]),
+        "cache_warmed": not ERROR_SIMULATION_ENABLED or random.choice([True, True, False]),
     }
     
     if not all(dependencies_ready.values()):
         failed_deps = [dep for dep, ready in dependencies_ready.items() if not ready]
         logger.warning(f"Dependencies not ready: {failed_deps}")
         
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "ready": False,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": iso_now(),
                 "dependencies": dependencies_ready,
                 "failed_dependencies": failed_deps
             }
@@ -424,7 +505,7 @@ async def readiness_check():
     
     return {
         "ready": True,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": iso_now(),
         "dependencies": dependencies_ready
     }
 
@@ -433,7 +514,7 @@ async def liveness_check():
     """Liveness check that indicates if application should be restarted"""
     
     # Simulate deadlock or unrecoverable states
-    if random.random() < 0.02:  # 2% chance
+    if ERROR_SIMULATION_ENABLED and random.random() < 0.02:  # 2% chance
         logger.critical("Liveness check failed - application may need restart")
         raise HTTPException(
             status_code=503,
@@ -442,9 +523,9 @@ async def liveness_check():
     
     return {
         "alive": True,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": iso_now(),
         "pid": os.getpid(),
-        "uptime_seconds": time.time() - start_time
+        "uptime_seconds": uptime_seconds()
     }
 
 # Health simulation control endpoints
@@ -453,13 +534,8 @@ async def enable_health_simulation(simulation_types: dict):
     """Enable health check error simulation"""
     global health_simulation
     
-    valid_types = {
-        "intermittent_failures", "memory_pressure", "disk_pressure", 
-        "slow_responses", "cascade_failures"
-    }
-    
     for sim_type, enabled in simulation_types.items():
-        if sim_type in valid_types:
+        if sim_type in _VALID_SIM_TYPES:
             health_simulation[sim_type] = enabled
             logger.info(f"Health simulation {sim_type}: {'enabled' if enabled else 'disabled'}")
         else:
@@ -478,13 +554,7 @@ async def get_health_simulation_status():
     """Get current health simulation settings"""
     return {
         "health_simulation_status": health_simulation,
-        "available_simulation_types": [
-            "intermittent_failures",
-            "memory_pressure", 
-            "disk_pressure",
-            "slow_responses",
-            "cascade_failures"
-        ],
+        "available_simulation_types": _AVAILABLE_SIM_TYPES,
         "health_check_failures": health_check_failures,
-        "total_requests": request_count
+        "total_requests": get_request_count()
     }
\ No newline at end of file
@@ -18,8 +18,10 @@ from . import api, health
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
 
+# The hostname is fixed for the life of the process
+_HOSTNAME = socket.gethostname()
+
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @router.get("/", response_class=HTMLResponse)
@@ -86,7 +88,7 @@ async def create_user_ui(
         
         # Create user (reuse logic from API)
         new_user = UserResponse(
-            id=len(api.users_db) + 1,
+            id=api.next_user_id(),
             name=user_request.name,
             email=user_request.email,
             age=user_request.age,
@@ -126,6 +128,7 @@ async def get_dashboard_data():
         cpu_freq = psutil.cpu_freq()
         virtual_memory = psutil.virtual_memory()
         disk_usage = psutil.disk_usage('/')
+        cpu_times = psutil.cpu_times()
         
         # Get network statistics
         network_stats = psutil.net_io_counters()
@@ -192,12 +195,12 @@ async def get_dashboard_data():
                 "network_packets_recv": network_stats.packets_recv,
                 "uptime_seconds": system_uptime,
                 "platform": platform.system(),
-                "hostname": socket.gethostname(),
+                "hostname": _HOSTNAME,
                 "python_version": platform.python_version()
             },
             "app": {
                 "total_users": len(api.users_db),
-                "total_requests": health.request_count,
+                "total_requests": health.get_request_count(),
                 "memory_usage_mb": round(memory_info.rss / (1024 * 1024), 2),
                 "memory_usage_percent": round((memory_info.rss / virtual_memory.total) * 100, 2),
                 "active_connections": len(connections),
@@ -210,7 +213,12 @@ async def get_dashboard_data():
             },
             "performance": {
                 "load_average": list(os.getloadavg()) if hasattr(os, 'getloadavg') else [0, 0, 0],
-                "cpu_times": psutil.cpu_times()._asdict(),
+                "cpu_times": {
+                    "user": cpu_times.user,
+                    "system": cpu_times.system,
+                    "idle": cpu_times.idle,
+                    "iowait": getattr(cpu_times, 'iowait', 0.0)
+                },
                 "memory_stats": {
                     "cached": getattr(virtual_memory, 'cached', 0),
                     "buffers": getattr(virtual_memory, 'buffers', 0),
@@ -468,7 +476,7 @@ async def get_error_statistics():
     """Get error statistics and simulation status"""
     return {
         "health_check_failures": health.health_check_failures,
-        "total_requests": health.request_count,
+        "total_requests": health.get_request_count(),
         "simulation_status": {
             "api_errors": api.error_simulation,
             "health_errors": health.health_simulation
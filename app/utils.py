@@ -0,0 +1,18 @@
+import os
+import time
+from datetime import datetime
+
+# Random failure injection is opt-in; read once at import so hot paths only test a bool
+ERROR_SIMULATION_ENABLED = os.getenv("ERROR_SIM", "0") == "1"
+
+# Cached ISO-8601 UTC timestamp, refreshed at most once per millisecond
+_ts_cache = [0.0, ""]
+
+
+def iso_now() -> str:
+    """Return the current UTC time as an ISO-8601 string, cached at 1ms granularity"""
+    t = time.time()
+    if t - _ts_cache[0] > 0.001:
+        _ts_cache[0] = t
+        _ts_cache[1] = datetime.utcfromtimestamp(t).isoformat()
+    return _ts_cache[1]
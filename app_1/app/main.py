@@ -1,4 +1,4 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from .routers import health, api, web
@@ -17,12 +17,16 @@ app = FastAPI(
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 # Request counter middleware
-@app.middleware("http")
-async def count_every_request(request: Request, call_next):
-    response = await call_next(request)
-    from .routers import health
-    health.request_count += 1
-    return response
+class RequestCountMiddleware:
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+        if scope["type"] == "http":
+            health.count_request()
+
+app.add_middleware(RequestCountMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -43,7 +47,32 @@ async def startup_event():
     print("🚀 FastAPI application starting up!")
     print(f"📊 OTEL endpoint: {os.getenv('OTEL_EXPORTER_OTLP_ENDPOINT', 'Not configured')}")
     print("🎨 Beautiful UI available at http://localhost:8000")
+    web.start_cpu_sampler()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await web.stop_cpu_sampler()
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # uvloop and httptools ship with uvicorn[standard] but are missing on Windows and slim installs
+    try:
+        import uvloop
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    try:
+        import httptools
+        http = "httptools"
+    except ImportError:
+        http = "auto"
+
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop=loop,
+        http=http,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
@@ -1,15 +1,23 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
-from datetime import datetime
 import random
 import asyncio
+import itertools
 from ..models import UserRequest, UserResponse
+from ..utils import utc_now
 
 router = APIRouter()
 
 # Simple in-memory storage
 users_db = []
 
+# Ids are never reused, so they stay unique after deletions and across awaits
+_user_ids = itertools.count(1)
+
+def next_user_id() -> int:
+    """Allocate the id for a new user"""
+    return next(_user_ids)
+
 @router.get("/")
 async def root():
     return {
@@ -21,11 +29,11 @@ async def root():
 @router.post("/users", response_model=UserResponse)
 async def create_user(user: UserRequest):
     new_user = UserResponse(
-        id=len(users_db) + 1,
+        id=next_user_id(),
         name=user.name,
         email=user.email,
         age=user.age,
-        created_at=datetime.utcnow()
+        created_at=utc_now()
     )
     users_db.append(new_user)
     return new_user
@@ -41,5 +49,5 @@ async def simulate_work():
     return {
         "message": "Work completed",
         "processing_time": f"{delay:.2f} seconds",
-        "timestamp": datetime.utcnow()
+        "timestamp": utc_now()
     }
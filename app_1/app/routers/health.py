@@ -1,35 +1,52 @@
 from fastapi import APIRouter
-from datetime import datetime
+import itertools
 import time
 import psutil
-import os
 from ..models import HealthResponse, MetricsResponse
+from ..utils import utc_now
 
 router = APIRouter()
 
+# Handle to this worker's process, built once rather than per request
+_process = psutil.Process()
+
 start_time = time.time()
-request_count = 0
+
+# Request counter: itertools.count does the increment in C, _last_request_count
+# holds the most recent value so it can be read without consuming a tick
+_request_counter = itertools.count(1)
+_last_request_count = [0]
+
+def count_request() -> int:
+    """Record one request and return the new total"""
+    _last_request_count[0] = value = next(_request_counter)
+    return value
+
+def get_request_count() -> int:
+    """Return the number of requests recorded so far"""
+    return _last_request_count[0]
 
 @router.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """Health check endpoint."""
     return HealthResponse(
         status="healthy",
-        timestamp=datetime.utcnow()
+        timestamp=utc_now()
     )
 
 @router.get("/metrics", response_model=MetricsResponse, tags=["Monitoring"])
 async def get_metrics():
     """Basic application metrics."""
-    global request_count
-    request_count += 1
+    total_requests = count_request()
     
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
+    process = _process
+    with process.oneshot():
+        memory_info = process.memory_info()
+        active_connections = len(process.connections())
     
     return MetricsResponse(
-        total_requests=request_count,
-        active_connections=len(process.connections()),
+        total_requests=total_requests,
+        active_connections=active_connections,
         uptime_seconds=time.time() - start_time,
         memory_usage_mb=memory_info.rss / (1024 * 1024)
     )
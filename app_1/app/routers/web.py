@@ -1,20 +1,68 @@
 from fastapi import APIRouter, Request, Form, HTTPException
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 from typing import Optional
+import asyncio
 import time
 import psutil
 import os
-from datetime import datetime
 import socket
 import platform
 
 # Import from other routers to access data
 from . import api, health
+from ..utils import iso_now, utc_now
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
 
+# Host facts that are fixed for the life of the process
+_HOSTNAME = socket.gethostname()
+_PLATFORM = platform.system()
+_PY_VERSION = platform.python_version()
+_CPU_COUNT = psutil.cpu_count()
+_BOOT_TIME = psutil.boot_time()
+_process = psutil.Process()
+
+# Byte scaling factors for the dashboard figures
+_INV_GB = 1.0 / (1024 ** 3)
+_INV_MB = 1.0 / (1024 * 1024)
+
+# Dashboard data is cached briefly so polling clients share one psutil sample
+DASHBOARD_CACHE_TTL = 1.0
+_dashboard_cache = None
+_dashboard_cache_ts = 0.0
+_dashboard_cache_lock = asyncio.Lock()
+
+# CPU usage sampled once a second in the background; interval=None never blocks
+CPU_SAMPLE_INTERVAL = 1.0
+psutil.cpu_percent(interval=None)  # prime the delta; the first reading is meaningless
+_cpu_percent = 0.0
+_cpu_sampler_task = None
+
+async def _cpu_sampler():
+    global _cpu_percent
+    while True:
+        await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+        _cpu_percent = psutil.cpu_percent(interval=None)
+
+def start_cpu_sampler():
+    """Start the background CPU usage sampler"""
+    global _cpu_sampler_task
+    if _cpu_sampler_task is None or _cpu_sampler_task.done():
+        _cpu_sampler_task = asyncio.create_task(_cpu_sampler())
+
+async def stop_cpu_sampler():
+    """Stop the background CPU usage sampler"""
+    global _cpu_sampler_task
+    if _cpu_sampler_task is not None:
+        _cpu_sampler_task.cancel()
+        try:
+            await _cpu_sampler_task
+        except asyncio.CancelledError:
+            pass
+        _cpu_sampler_task = None
+
 @router.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Main dashboard page"""
@@ -48,79 +96,104 @@ async def create_user_ui(
     
     # Create user (reuse logic from API)
     new_user = UserResponse(
-        id=len(api.users_db) + 1,
+        id=api.next_user_id(),
         name=user_request.name,
         email=user_request.email,
         age=user_request.age,
-        created_at=datetime.utcnow()
+        created_at=utc_now()
     )
     api.users_db.append(new_user)
     
     return RedirectResponse(url="/users-ui", status_code=303)
 
-@router.get("/api/dashboard-data")
+@router.get("/api/dashboard-data", response_class=ORJSONResponse)
 async def get_dashboard_data():
     """Enhanced API endpoint for comprehensive dashboard data"""
-    process = psutil.Process(os.getpid())
-    memory_info = process.memory_info()
+    return await _get_dashboard_snapshot()
+
+async def _get_dashboard_snapshot():
+    """Return the cached dashboard snapshot, refreshing it once the TTL has passed"""
+    global _dashboard_cache, _dashboard_cache_ts
+    
+    if _dashboard_cache is None or time.monotonic() - _dashboard_cache_ts >= DASHBOARD_CACHE_TTL:
+        async with _dashboard_cache_lock:
+            # Another request may have refreshed it while this one waited for the lock
+            if _dashboard_cache is None or time.monotonic() - _dashboard_cache_ts >= DASHBOARD_CACHE_TTL:
+                # psutil reads /proc synchronously, so collect off the event loop
+                _dashboard_cache = await asyncio.to_thread(_build_dashboard_data)
+                _dashboard_cache_ts = time.monotonic()
+    
+    return _dashboard_cache
+
+def _build_dashboard_data():
+    """Collect a fresh dashboard snapshot (blocking; run in a worker thread)"""
+    process = _process
+    
+    # Get process information; oneshot() caches the /proc/<pid> reads for the block
+    with process.oneshot():
+        memory_info = process.memory_info()
+        connections = process.connections()
+        threads = process.num_threads()
+        process_cpu_percent = process.cpu_percent()
+        open_files_count = len(process.open_files()) if hasattr(process, 'open_files') else 0
     
     # Get detailed system information
-    cpu_count = psutil.cpu_count()
     cpu_freq = psutil.cpu_freq()
     virtual_memory = psutil.virtual_memory()
     disk_usage = psutil.disk_usage('/')
+    cpu_times = psutil.cpu_times()
     
     # Get network statistics
     network_stats = psutil.net_io_counters()
     
-    # Get process information
-    connections = process.connections()
-    threads = process.num_threads()
-    
     # Boot time and uptime
-    boot_time = psutil.boot_time()
     current_time = time.time()
-    system_uptime = current_time - boot_time
+    system_uptime = current_time - _BOOT_TIME
     app_uptime = current_time - health.start_time
     
     return {
         "system": {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "cpu_count": cpu_count,
+            "cpu_percent": _cpu_percent,
+            "cpu_count": _CPU_COUNT,
             "cpu_freq_current": cpu_freq.current if cpu_freq else 0,
             "cpu_freq_max": cpu_freq.max if cpu_freq else 0,
             "memory_percent": virtual_memory.percent,
-            "memory_total_gb": round(virtual_memory.total / (1024**3), 2),
-            "memory_used_gb": round(virtual_memory.used / (1024**3), 2),
-            "memory_available_gb": round(virtual_memory.available / (1024**3), 2),
+            "memory_total_gb": round(virtual_memory.total * _INV_GB, 2),
+            "memory_used_gb": round(virtual_memory.used * _INV_GB, 2),
+            "memory_available_gb": round(virtual_memory.available * _INV_GB, 2),
             "disk_percent": round((disk_usage.used / disk_usage.total) * 100, 1),
-            "disk_total_gb": round(disk_usage.total / (1024**3), 2),
-            "disk_used_gb": round(disk_usage.used / (1024**3), 2),
-            "disk_free_gb": round(disk_usage.free / (1024**3), 2),
+            "disk_total_gb": round(disk_usage.total * _INV_GB, 2),
+            "disk_used_gb": round(disk_usage.used * _INV_GB, 2),
+            "disk_free_gb": round(disk_usage.free * _INV_GB, 2),
             "network_bytes_sent": network_stats.bytes_sent,
             "network_bytes_recv": network_stats.bytes_recv,
             "network_packets_sent": network_stats.packets_sent,
             "network_packets_recv": network_stats.packets_recv,
             "uptime_seconds": system_uptime,
-            "platform": platform.system(),
-            "hostname": socket.gethostname(),
-            "python_version": platform.python_version()
+            "platform": _PLATFORM,
+            "hostname": _HOSTNAME,
+            "python_version": _PY_VERSION
         },
         "app": {
             "total_users": len(api.users_db),
-            "total_requests": health.request_count,
-            "memory_usage_mb": round(memory_info.rss / (1024 * 1024), 2),
+            "total_requests": health.get_request_count(),
+            "memory_usage_mb": round(memory_info.rss * _INV_MB, 2),
             "memory_usage_percent": round((memory_info.rss / virtual_memory.total) * 100, 2),
             "active_connections": len(connections),
             "threads_count": threads,
             "uptime_seconds": app_uptime,
             "process_id": process.pid,
-            "cpu_percent": process.cpu_percent(),
-            "open_files": len(process.open_files()) if hasattr(process, 'open_files') else 0
+            "cpu_percent": process_cpu_percent,
+            "open_files": open_files_count
         },
         "performance": {
             "load_average": list(os.getloadavg()) if hasattr(os, 'getloadavg') else [0, 0, 0],
-            "cpu_times": psutil.cpu_times()._asdict(),
+            "cpu_times": {
+                "user": cpu_times.user,
+                "system": cpu_times.system,
+                "idle": cpu_times.idle,
+                "iowait": getattr(cpu_times, 'iowait', 0.0)
+            },
             "memory_stats": {
                 "cached": getattr(virtual_memory, 'cached', 0),
                 "buffers": getattr(virtual_memory, 'buffers', 0),
@@ -129,20 +202,22 @@ async def get_dashboard_data():
         }
     }
 
-@router.get("/api/system-history")
+@router.get("/api/system-history", response_class=ORJSONResponse)
 async def get_system_history():
     """Get historical system performance data for charts"""
     # This would typically come from a database or time-series storage
-    # For now, we'll return current data that JavaScript can use to build history
-    current_data = await get_dashboard_data()
+    # For now, we'll return current data that JavaScript can use to build history,
+    # sliced from the shared dashboard snapshot rather than rebuilding it
+    snapshot = await _get_dashboard_snapshot()
+    system = snapshot["system"]
     
     return {
-        "timestamp": datetime.utcnow().isoformat(),
-        "cpu": current_data["system"]["cpu_percent"],
-        "memory": current_data["system"]["memory_percent"],
-        "disk": current_data["system"]["disk_percent"],
-        "network_sent": current_data["system"]["network_bytes_sent"],
-        "network_recv": current_data["system"]["network_bytes_recv"],
-        "app_memory": current_data["app"]["memory_usage_mb"],
-        "requests": current_data["app"]["total_requests"]
+        "timestamp": iso_now(),
+        "cpu": system["cpu_percent"],
+        "memory": system["memory_percent"],
+        "disk": system["disk_percent"],
+        "network_sent": system["network_bytes_sent"],
+        "network_recv": system["network_bytes_recv"],
+        "app_memory": snapshot["app"]["memory_usage_mb"],
+        "requests": snapshot["app"]["total_requests"]
     }
@@ -249,6 +249,9 @@ async def startup_event():
         # Initialize error tracking
         error_tracker["startup_time"] = datetime.utcnow().isoformat()
         
+        # Sample CPU usage in the background instead of blocking dashboard requests
+        web.start_cpu_sampler()
+        
         # Log environment information
         logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'development')}")
         logger.info(f"Debug mode: {os.getenv('DEBUG', 'False')}")
@@ -263,6 +266,7 @@ async def shutdown_event():
     """Application shutdown with cleanup"""
     try:
         logger.info("🛑 FastAPI application shutting down...")
+        await web.stop_cpu_sampler()
         logger.info(f"Total errors during runtime: {error_tracker['total_errors']}")
         logger.info(f"Error types: {error_tracker['error_types']}")
         logger.info("Application shutdown completed successfully")
@@ -299,14 +303,29 @@ async def root():
 if __name__ == "__main__":
     import uvicorn
     
+    # uvloop and httptools ship with uvicorn[standard] but are missing on Windows and slim installs
+    try:
+        import uvloop
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"
+    try:
+        import httptools
+        http = "httptools"
+    except ImportError:
+        http = "auto"
+    
     try:
         logger.info("Starting server with uvicorn...")
         uvicorn.run(
-            app, 
+            "app.main:app",
             host="0.0.0.0", 
             port=8000,
             log_level="info",
-            access_log=True
+            access_log=True,
+            loop=loop,
+            http=http,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1"))
         )
     except Exception as e:
         logger.critical(f"Failed to start server: {str(e)}")
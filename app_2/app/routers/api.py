@@ -1,21 +1,54 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse
-from typing import List, Optional
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import random
 import asyncio
+import itertools
 import time
 import logging
+import orjson
 from ..models import UserRequest, UserResponse
 
 router = APIRouter()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (handlers are set up in app.main)
 logger = logging.getLogger(__name__)
 
-# Simple in-memory storage
-users_db = []
+# Simple in-memory storage keyed by id (insertion ordered), plus an email index
+users_db: Dict[int, UserResponse] = {}
+users_by_email: Dict[str, UserResponse] = {}
+
+# Lowercased (name, email) per user id, computed once at insert for search
+_search_keys: Dict[int, Tuple[str, str]] = {}
+
+# Ids are never reused, so they stay unique after deletions
+_user_ids = itertools.count(1)
+
+def next_user_id() -> int:
+    """Allocate the id for a new user"""
+    return next(_user_ids)
+
+# Unpaginated user lists at least this long are streamed rather than encoded in one body
+STREAM_MIN_USERS = 1000
+STREAM_BATCH_SIZE = 256
+
+async def _stream_users(users: List[UserResponse]):
+    """Yield a JSON array of users, encoding one batch at a time"""
+    yield b"["
+    for i in range(0, len(users), STREAM_BATCH_SIZE):
+        if i:
+            yield b","
+        # Strip each batch's own brackets so the chunks join into one array
+        yield orjson.dumps([user.__dict__ for user in users[i:i + STREAM_BATCH_SIZE]])[1:-1]
+        await asyncio.sleep(0)
+    yield b"]"
+
+def store_user(new_user: UserResponse):
+    """Add a user to storage and the email index"""
+    users_db[new_user.id] = new_user
+    users_by_email[new_user.email] = new_user
+    _search_keys[new_user.id] = (new_user.name.lower(), new_user.email.lower())
 
 # Custom exceptions for application errors
 class DatabaseConnectionError(Exception):
@@ -40,13 +73,33 @@ error_simulation = {
     "validation_errors": False,
     "service_errors": False,
     "rate_limit_errors": False,
-    "random_errors": False
+    "random_errors": False,
+    "simulate_latency": False
 }
 
+# Error types accepted by /error-simulation/enable
+_AVAILABLE_ERROR_TYPES = (
+    "database_errors",
+    "validation_errors",
+    "service_errors",
+    "rate_limit_errors",
+    "random_errors",
+    "simulate_latency"
+)
+_VALID_ERROR_TYPES = frozenset(_AVAILABLE_ERROR_TYPES)
+
+# True when any simulation flag is on; lets handlers skip the checks on the normal path
+any_error_simulation = False
+
+def refresh_error_simulation_flag():
+    """Recompute any_error_simulation after error_simulation has been changed"""
+    global any_error_simulation
+    any_error_simulation = any(error_simulation.values())
+
 @router.get("/")
 async def root():
     """Root endpoint with potential errors"""
-    if error_simulation.get("random_errors") and random.random() < 0.1:
+    if any_error_simulation and error_simulation.get("random_errors") and random.random() < 0.1:
         raise HTTPException(status_code=503, detail="Service temporarily unavailable")
     
     return {
@@ -61,27 +114,28 @@ async def root():
 async def create_user(user: UserRequest, request: Request):
     """Create user with comprehensive error handling"""
     
-    # Simulate rate limiting
-    if error_simulation.get("rate_limit_errors") and random.random() < 0.2:
-        logger.warning(f"Rate limit exceeded for IP: {request.client.host}")
-        raise HTTPException(
-            status_code=429, 
-            detail="Too many requests. Please try again later.",
-            headers={"Retry-After": "60"}
-        )
-    
-    # Simulate validation errors
-    if error_simulation.get("validation_errors") and random.random() < 0.15:
-        logger.error(f"Validation failed for user: {user.name}")
-        raise HTTPException(
-            status_code=422,
-            detail="Validation failed: Invalid user data provided"
-        )
-    
-    # Simulate database connection errors
-    if error_simulation.get("database_errors") and random.random() < 0.1:
-        logger.error("Database connection failed during user creation")
-        raise DatabaseConnectionError("Unable to connect to user database")
+    if any_error_simulation:
+        # Simulate rate limiting
+        if error_simulation.get("rate_limit_errors") and random.random() < 0.2:
+            logger.warning("Rate limit exceeded for IP: %s", request.client.host)
+            raise HTTPException(
+                status_code=429, 
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": "60"}
+            )
+        
+        # Simulate validation errors
+        if error_simulation.get("validation_errors") and random.random() < 0.15:
+            logger.error("Validation failed for user: %s", user.name)
+            raise HTTPException(
+                status_code=422,
+                detail="Validation failed: Invalid user data provided"
+            )
+        
+        # Simulate database connection errors
+        if error_simulation.get("database_errors") and random.random() < 0.1:
+            logger.error("Database connection failed during user creation")
+            raise DatabaseConnectionError("Unable to connect to user database")
     
     # Email validation
     if not user.email or "@" not in user.email:
@@ -91,7 +145,7 @@ async def create_user(user: UserRequest, request: Request):
         )
     
     # Check for duplicate email
-    if any(existing_user.email == user.email for existing_user in users_db):
+    if user.email in users_by_email:
         raise HTTPException(
             status_code=409,
             detail=f"User with email {user.email} already exists"
@@ -105,24 +159,25 @@ async def create_user(user: UserRequest, request: Request):
         )
     
     try:
-        # Simulate processing delay
-        await asyncio.sleep(random.uniform(0.1, 0.3))
+        # Simulate processing delay; opt-in only, it capped create throughput at a few req/s
+        if any_error_simulation and error_simulation.get("simulate_latency"):
+            await asyncio.sleep(random.uniform(0.1, 0.3))
         
         new_user = UserResponse(
-            id=len(users_db) + 1,
+            id=next_user_id(),
             name=user.name,
             email=user.email,
             age=user.age,
             created_at=datetime.utcnow()
         )
         
-        users_db.append(new_user)
-        logger.info(f"User created successfully: {new_user.id}")
+        store_user(new_user)
+        logger.info("User created successfully: %s", new_user.id)
         
         return new_user
         
     except Exception as e:
-        logger.error(f"Unexpected error creating user: {str(e)}")
+        logger.error("Unexpected error creating user: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Internal server error occurred while creating user"
@@ -137,7 +192,7 @@ async def get_users(
     """Get users with filtering and error simulation"""
     
     # Simulate service errors
-    if error_simulation.get("service_errors") and random.random() < 0.05:
+    if any_error_simulation and error_simulation.get("service_errors") and random.random() < 0.05:
         logger.error("External service dependency failed")
         raise HTTPException(
             status_code=502,
@@ -158,26 +213,32 @@ async def get_users(
         )
     
     try:
-        filtered_users = users_db
+        filtered_users = users_db.values()
         
-        # Apply search filter
+        # Apply search filter lazily so it fuses with pagination
         if search:
-            filtered_users = [
-                user for user in users_db 
-                if search.lower() in user.name.lower() or search.lower() in user.email.lower()
-            ]
+            q = search.lower()
+            filtered_users = (
+                users_db[user_id] for user_id, (name_lc, email_lc) in _search_keys.items()
+                if q in name_lc or q in email_lc
+            )
         
-        # Apply pagination
-        if offset:
-            filtered_users = filtered_users[offset:]
+        # Apply pagination in a single pass, materializing only the returned page
+        start = offset or 0
+        stop = start + limit if limit else None
         
-        if limit:
-            filtered_users = filtered_users[:limit]
+        # Snapshot the references up front; users_db may change while a large body streams
+        page = list(itertools.islice(filtered_users, start, stop))
         
-        return filtered_users
+        # Stored users are already validated UserResponse models, so encode their
+        # field dicts with orjson rather than re-validating through response_model
+        if len(page) >= STREAM_MIN_USERS:
+            return StreamingResponse(_stream_users(page), media_type="application/json")
+        
+        return ORJSONResponse([user.__dict__ for user in page])
         
     except Exception as e:
-        logger.error(f"Error retrieving users: {str(e)}")
+        logger.error("Error retrieving users: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Failed to retrieve users"
@@ -194,13 +255,13 @@ async def get_user(user_id: int):
         )
     
     # Simulate random errors
-    if error_simulation.get("random_errors") and random.random() < 0.08:
+    if any_error_simulation and error_simulation.get("random_errors") and random.random() < 0.08:
         raise HTTPException(
             status_code=500,
             detail="Random internal server error"
         )
     
-    user = next((user for user in users_db if user.id == user_id), None)
+    user = users_db.get(user_id)
     
     if not user:
         raise HTTPException(
@@ -221,27 +282,26 @@ async def delete_user(user_id: int):
         )
     
     # Simulate database errors
-    if error_simulation.get("database_errors") and random.random() < 0.1:
-        logger.error(f"Database error during user deletion: {user_id}")
+    if any_error_simulation and error_simulation.get("database_errors") and random.random() < 0.1:
+        logger.error("Database error during user deletion: %s", user_id)
         raise HTTPException(
             status_code=500,
             detail="Database error occurred during deletion"
         )
     
-    user_index = next(
-        (i for i, user in enumerate(users_db) if user.id == user_id), 
-        None
-    )
+    deleted_user = users_db.pop(user_id, None)
     
-    if user_index is None:
+    if deleted_user is None:
         raise HTTPException(
             status_code=404,
             detail=f"User with ID {user_id} not found"
         )
     
     try:
-        deleted_user = users_db.pop(user_index)
-        logger.info(f"User deleted: {deleted_user.id}")
+        _search_keys.pop(user_id, None)
+        if users_by_email.get(deleted_user.email) is deleted_user:
+            del users_by_email[deleted_user.email]
+        logger.info("User deleted: %s", deleted_user.id)
         
         return {
             "message": f"User {user_id} deleted successfully",
@@ -249,7 +309,7 @@ async def delete_user(user_id: int):
         }
         
     except Exception as e:
-        logger.error(f"Error deleting user {user_id}: {str(e)}")
+        logger.error("Error deleting user %s: %s", user_id, e)
         raise HTTPException(
             status_code=500,
             detail="Failed to delete user"
@@ -299,7 +359,7 @@ async def simulate_work():
             detail="Work simulation timed out"
         )
     except Exception as e:
-        logger.error(f"Unexpected error in work simulation: {str(e)}")
+        logger.error("Unexpected error in work simulation: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Unexpected error occurred during work simulation"
@@ -311,21 +371,19 @@ async def enable_error_simulation(error_types: dict):
     """Enable specific error types for testing"""
     global error_simulation
     
-    valid_types = {
-        "database_errors", "validation_errors", 
-        "service_errors", "rate_limit_errors", "random_errors"
-    }
-    
     for error_type, enabled in error_types.items():
-        if error_type in valid_types:
+        if error_type in _VALID_ERROR_TYPES:
             error_simulation[error_type] = enabled
-            logger.info(f"Error simulation {error_type}: {'enabled' if enabled else 'disabled'}")
+            logger.info("Error simulation %s: %s", error_type, "enabled" if enabled else "disabled")
         else:
+            refresh_error_simulation_flag()
             raise HTTPException(
                 status_code=400,
                 detail=f"Unknown error type: {error_type}"
             )
     
+    refresh_error_simulation_flag()
+    
     return {
         "message": "Error simulation settings updated",
         "current_settings": error_simulation
@@ -336,41 +394,36 @@ async def get_error_simulation_status():
     """Get current error simulation settings"""
     return {
         "error_simulation_status": error_simulation,
-        "available_error_types": [
-            "database_errors",
-            "validation_errors", 
-            "service_errors",
-            "rate_limit_errors",
-            "random_errors"
-        ]
+        "available_error_types": _AVAILABLE_ERROR_TYPES
     }
 
+# Default detail for each status code /trigger-error can raise
+_ERROR_MESSAGES = {
+    400: "Bad Request - Invalid input provided",
+    401: "Unauthorized - Authentication required",
+    403: "Forbidden - Access denied",
+    404: "Not Found - Resource does not exist", 
+    409: "Conflict - Resource already exists",
+    422: "Unprocessable Entity - Validation failed",
+    429: "Too Many Requests - Rate limit exceeded",
+    500: "Internal Server Error - Server encountered an error",
+    502: "Bad Gateway - Upstream server error",
+    503: "Service Unavailable - Service temporarily down",
+    504: "Gateway Timeout - Upstream server timeout"
+}
+
 @router.post("/trigger-error/{error_code}")
 async def trigger_specific_error(error_code: int, message: Optional[str] = None):
     """Manually trigger specific HTTP error codes"""
     
-    error_messages = {
-        400: "Bad Request - Invalid input provided",
-        401: "Unauthorized - Authentication required",
-        403: "Forbidden - Access denied",
-        404: "Not Found - Resource does not exist", 
-        409: "Conflict - Resource already exists",
-        422: "Unprocessable Entity - Validation failed",
-        429: "Too Many Requests - Rate limit exceeded",
-        500: "Internal Server Error - Server encountered an error",
-        502: "Bad Gateway - Upstream server error",
-        503: "Service Unavailable - Service temporarily down",
-        504: "Gateway Timeout - Upstream server timeout"
-    }
-    
-    if error_code not in error_messages:
+    if error_code not in _ERROR_MESSAGES:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported error code: {error_code}"
         )
     
-    error_detail = message or error_messages[error_code]
-    logger.error(f"Manually triggered error {error_code}: {error_detail}")
+    error_detail = message or _ERROR_MESSAGES[error_code]
+    logger.error("Manually triggered error %s: %s", error_code, error_detail)
     
     # Add retry-after header for 429 and 503
     headers = {}
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request, Form, HTTPException
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from jinja2 import FileSystemBytecodeCache
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse, JSONResponse, Response, StreamingResponse
 from typing import Optional
 import time
 import psutil
@@ -8,60 +9,144 @@ import os
 import random
 import logging
 import asyncio
-from datetime import datetime
 import socket
 import platform
+import orjson
 
 # Import from other routers to access data
 from . import api, health
+from ..utils import iso_now, utc_now
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
+# Compiled template bytecode is cached on disk so other workers and restarts skip parsing.
+# Loaded templates are kept for the process lifetime and only re-checked on disk in debug mode.
+templates = Jinja2Templates(
+    directory="app/templates",
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=DEBUG,
+    cache_size=-1
+)
+
+# Host facts that are fixed for the life of the process
+_HOSTNAME = socket.gethostname()
+_PLATFORM = platform.system()
+_PY_VERSION = platform.python_version()
+_CPU_COUNT = psutil.cpu_count()
+_BOOT_TIME = psutil.boot_time()
+
+# This process, reused so psutil keeps its CPU-time baseline between calls
+_process = psutil.Process(os.getpid())
+
+# Platform capabilities, probed once
+_HAS_OPEN_FILES = hasattr(_process, 'open_files')
+_HAS_LOADAVG = hasattr(os, 'getloadavg')
+
+# Byte scaling factors for the dashboard figures
+_INV_GB = 1.0 / (1024 ** 3)
+_INV_MB = 1.0 / (1024 * 1024)
+
+# CPU usage sampled once a second in the background; interval=None never blocks
+CPU_SAMPLE_INTERVAL = 1.0
+psutil.cpu_percent(interval=None)  # prime the delta; the first reading is meaningless
+_cpu_percent = 0.0
+_cpu_sampler_task = None
+
+# System snapshot shared by dashboard polls for DASHBOARD_CACHE_TTL seconds
+DASHBOARD_CACHE_TTL = float(os.getenv("DASHBOARD_CACHE_TTL", "2.0"))
+_dashboard_cache = None
+_dashboard_cache_body = b""
+_dashboard_cache_ts = 0.0
+_dashboard_cache_lock = asyncio.Lock()
+
+# Uvicorn drains open connections before running the shutdown hooks, so each dashboard stream
+# ends after this many seconds and the browser reconnects instead of holding shutdown open
+DASHBOARD_STREAM_MAX_AGE = float(os.getenv("DASHBOARD_STREAM_MAX_AGE", "15.0"))
+
+# Payload served in place of the snapshot when corrupted dashboard data is simulated
+_CORRUPTED_DASHBOARD_BODY = orjson.dumps({
+    "system": {
+        "cpu_percent": -1,  # Invalid CPU percentage
+        "memory_percent": 150.0,  # Invalid memory percentage
+        "error": "Data corruption detected"
+    },
+    "app": {
+        "total_users": -5,  # Invalid user count
+        "error": "Corrupted application metrics"
+    }
+})
+
+# Counts that scan every descriptor of the process are refreshed less often than the snapshot
+CONNECTIONS_CACHE_TTL = 30.0
+OPEN_FILES_CACHE_TTL = 5.0
+_throttled_stats = {}
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def _cpu_sampler():
+    global _cpu_percent
+    while True:
+        await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+        _cpu_percent = psutil.cpu_percent(interval=None)
+
+def start_cpu_sampler():
+    """Start the background CPU usage sampler"""
+    global _cpu_sampler_task
+    if _cpu_sampler_task is None or _cpu_sampler_task.done():
+        _cpu_sampler_task = asyncio.create_task(_cpu_sampler())
+
+async def stop_cpu_sampler():
+    """Stop the background CPU usage sampler"""
+    global _cpu_sampler_task
+    if _cpu_sampler_task is not None:
+        _cpu_sampler_task.cancel()
+        try:
+            await _cpu_sampler_task
+        except asyncio.CancelledError:
+            pass
+        _cpu_sampler_task = None
+
+# Pages whose templates use no per-request data, rendered once per process outside debug mode
+_page_cache = {}
+
+def _chance(out_of_256: int) -> bool:
+    """Return True with probability out_of_256 / 256, from a single 8-bit draw"""
+    return random.getrandbits(8) < out_of_256
+
+def _static_page(name: str) -> HTMLResponse:
+    """Serve a page whose template takes no context, rendering it only once outside debug mode"""
+    body = _page_cache.get(name)
+    if body is None:
+        body = templates.get_template(name).render().encode("utf-8")
+        # In debug mode template edits must show up, so render on every request
+        if not DEBUG:
+            _page_cache[name] = body
+    return HTMLResponse(body)
+
 @router.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Main dashboard page with error testing capabilities"""
-    return templates.TemplateResponse("dashboard.html", {"request": request})
+    return _static_page("dashboard.html")
 
 @router.get("/users-ui", response_class=HTMLResponse)
 async def users_page(request: Request):
     """Users management page"""
-    users = api.users_db
-    return templates.TemplateResponse("users.html", {
-        "request": request, 
-        "users": users
-    })
+    users = list(api.users_db.values())
+    return HTMLResponse(templates.get_template("users.html").render(users=users))
 
 @router.get("/metrics-ui", response_class=HTMLResponse)
 async def metrics_page(request: Request):
     """Metrics dashboard page"""
-    return templates.TemplateResponse("metrics.html", {"request": request})
+    return _static_page("metrics.html")
 
 @router.get("/errors-ui", response_class=HTMLResponse)
 async def errors_page(request: Request):
     """Error testing and simulation page"""
-    try:
-        # Safely access the error simulation dictionaries with defaults
-        api_errors = getattr(api, 'error_simulation', {})
-        health_errors = getattr(health, 'health_simulation', {})
-        
-        return templates.TemplateResponse("errors.html", {
-            "request": request,
-            "api_errors": api_errors,
-            "health_errors": health_errors
-        })
-    except Exception as e:
-        # Fallback if there are issues accessing the simulation dictionaries
-        logger.error(f"Error loading errors page: {str(e)}")
-        return templates.TemplateResponse("errors.html", {
-            "request": request,
-            "api_errors": {},
-            "health_errors": {}
-        })
+    # The page loads the simulation state itself from the status endpoints
+    return _static_page("errors.html")
 
 @router.post("/users-ui")
 async def create_user_ui(
@@ -77,7 +162,7 @@ async def create_user_ui(
         user_request = UserRequest(name=name, email=email, age=age)
         
         # Simulate form processing errors
-        if random.random() < 0.05:  # 5% chance
+        if _chance(13):  # ~5% chance
             logger.error("Form processing error")
             raise HTTPException(
                 status_code=500,
@@ -86,13 +171,13 @@ async def create_user_ui(
         
         # Create user (reuse logic from API)
         new_user = UserResponse(
-            id=len(api.users_db) + 1,
+            id=api.next_user_id(),
             name=user_request.name,
             email=user_request.email,
             age=user_request.age,
-            created_at=datetime.utcnow()
+            created_at=utc_now()
         )
-        api.users_db.append(new_user)
+        api.store_user(new_user)
         
         return RedirectResponse(url="/users-ui", status_code=303)
         
@@ -105,124 +190,14 @@ async def create_user_ui(
             detail="Internal server error during user creation"
         )
 
-@router.get("/api/dashboard-data")
+@router.get("/api/dashboard-data", response_class=ORJSONResponse)
 async def get_dashboard_data():
     """Enhanced API endpoint for comprehensive dashboard data with error simulation"""
-    
-    # Simulate data collection errors
-    if random.random() < 0.03:  # 3% chance
-        logger.error("Dashboard data collection failed")
-        raise HTTPException(
-            status_code=503,
-            detail="Unable to collect dashboard data"
-        )
-    
     try:
-        process = psutil.Process(os.getpid())
-        memory_info = process.memory_info()
-        
-        # Get detailed system information
-        cpu_count = psutil.cpu_count()
-        cpu_freq = psutil.cpu_freq()
-        virtual_memory = psutil.virtual_memory()
-        disk_usage = psutil.disk_usage('/')
-        
-        # Get network statistics
-        network_stats = psutil.net_io_counters()
-        
-        # Get process information
-        connections = process.connections()
-        threads = process.num_threads()
-        
-        # Boot time and uptime
-        boot_time = psutil.boot_time()
-        current_time = time.time()
-        system_uptime = current_time - boot_time
-        app_uptime = current_time - health.start_time
-        
-        # Safely access error simulation dictionaries
-        api_errors = getattr(api, 'error_simulation', {
-            "database_errors": False,
-            "validation_errors": False,
-            "service_errors": False,
-            "rate_limit_errors": False,
-            "random_errors": False
-        })
-        
-        health_errors = getattr(health, 'health_simulation', {
-            "intermittent_failures": False,
-            "memory_pressure": False,
-            "disk_pressure": False,
-            "slow_responses": False,
-            "cascade_failures": False
-        })
-        
-        # Simulate occasional data corruption for testing
-        if random.random() < 0.02:  # 2% chance
-            logger.warning("Simulating corrupted dashboard data")
-            return {
-                "system": {
-                    "cpu_percent": -1,  # Invalid CPU percentage
-                    "memory_percent": 150.0,  # Invalid memory percentage
-                    "error": "Data corruption detected"
-                },
-                "app": {
-                    "total_users": -5,  # Invalid user count
-                    "error": "Corrupted application metrics"
-                }
-            }
-        
-        return {
-            "system": {
-                "cpu_percent": psutil.cpu_percent(interval=1),
-                "cpu_count": cpu_count,
-                "cpu_freq_current": cpu_freq.current if cpu_freq else 0,
-                "cpu_freq_max": cpu_freq.max if cpu_freq else 0,
-                "memory_percent": virtual_memory.percent,
-                "memory_total_gb": round(virtual_memory.total / (1024**3), 2),
-                "memory_used_gb": round(virtual_memory.used / (1024**3), 2),
-                "memory_available_gb": round(virtual_memory.available / (1024**3), 2),
-                "disk_percent": round((disk_usage.used / disk_usage.total) * 100, 1),
-                "disk_total_gb": round(disk_usage.total / (1024**3), 2),
-                "disk_used_gb": round(disk_usage.used / (1024**3), 2),
-                "disk_free_gb": round(disk_usage.free / (1024**3), 2),
-                "network_bytes_sent": network_stats.bytes_sent,
-                "network_bytes_recv": network_stats.bytes_recv,
-                "network_packets_sent": network_stats.packets_sent,
-                "network_packets_recv": network_stats.packets_recv,
-                "uptime_seconds": system_uptime,
-                "platform": platform.system(),
-                "hostname": socket.gethostname(),
-                "python_version": platform.python_version()
-            },
-            "app": {
-                "total_users": len(api.users_db),
-                "total_requests": health.request_count,
-                "memory_usage_mb": round(memory_info.rss / (1024 * 1024), 2),
-                "memory_usage_percent": round((memory_info.rss / virtual_memory.total) * 100, 2),
-                "active_connections": len(connections),
-                "threads_count": threads,
-                "uptime_seconds": app_uptime,
-                "process_id": process.pid,
-                "cpu_percent": process.cpu_percent(),
-                "open_files": len(process.open_files()) if hasattr(process, 'open_files') else 0,
-                "health_check_failures": getattr(health, 'health_check_failures', 0)
-            },
-            "performance": {
-                "load_average": list(os.getloadavg()) if hasattr(os, 'getloadavg') else [0, 0, 0],
-                "cpu_times": psutil.cpu_times()._asdict(),
-                "memory_stats": {
-                    "cached": getattr(virtual_memory, 'cached', 0),
-                    "buffers": getattr(virtual_memory, 'buffers', 0),
-                    "shared": getattr(virtual_memory, 'shared', 0)
-                }
-            },
-            "errors": {
-                "api_simulation": api_errors,
-                "health_simulation": health_errors
-            }
-        }
+        return Response(await _dashboard_payload(), media_type="application/json")
         
+    except HTTPException:
+        raise
     except psutil.Error as e:
         logger.error(f"PSUtil error in dashboard data: {str(e)}")
         raise HTTPException(
@@ -236,12 +211,181 @@ async def get_dashboard_data():
             detail="Failed to retrieve dashboard data"
         )
 
-@router.get("/api/system-history")
+@router.get("/api/dashboard-data/stream")
+async def stream_dashboard_data():
+    """Push dashboard data as server-sent events, one event per snapshot refresh"""
+    async def events():
+        deadline = time.monotonic() + DASHBOARD_STREAM_MAX_AGE
+        while time.monotonic() < deadline:
+            try:
+                yield b"data: " + await _dashboard_payload() + b"\n\n"
+            except HTTPException as e:
+                yield _fault_event(e.detail)
+            except Exception as e:
+                logger.error(f"Unexpected error in dashboard stream: {str(e)}")
+                yield _fault_event("Failed to retrieve dashboard data")
+            await asyncio.sleep(DASHBOARD_CACHE_TTL)
+        # Planned end of this connection; the client opens a fresh stream right away
+        yield b"event: reconnect\ndata: {}\n\n"
+    
+    # Every subscriber reads the same cached snapshot, so collection cost does not grow with clients
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+def _fault_event(detail: str) -> bytes:
+    """Encode a dashboard failure as a server-sent "fault" event"""
+    return b"event: fault\ndata: " + orjson.dumps({"detail": detail}) + b"\n\n"
+
+async def _dashboard_payload() -> bytes:
+    """Return the encoded dashboard payload, with the simulated collection faults applied"""
+    # One draw decides both simulated faults: collection errors, then corrupted data
+    roll = random.getrandbits(8)
+    
+    # Simulate data collection errors
+    if roll < 8:  # ~3% chance
+        logger.error("Dashboard data collection failed")
+        raise HTTPException(
+            status_code=503,
+            detail="Unable to collect dashboard data"
+        )
+    
+    # Simulate occasional data corruption for testing
+    if roll < 13:  # ~2% chance
+        logger.warning("Simulating corrupted dashboard data")
+        return _CORRUPTED_DASHBOARD_BODY
+    
+    return await _dashboard_body()
+
+async def _dashboard_body() -> bytes:
+    """Encode the dashboard payload: the cached snapshot plus the live simulation status"""
+    await _get_dashboard_snapshot()
+    
+    # Only the simulation status is encoded per call; the snapshot JSON is reused
+    errors = orjson.dumps({
+        "api_simulation": api.error_simulation,
+        "health_simulation": health.health_simulation
+    })
+    return _dashboard_cache_body + errors + b"}"
+
+async def _get_dashboard_snapshot():
+    """Return the cached system snapshot, refreshing it once the TTL has passed"""
+    global _dashboard_cache, _dashboard_cache_body, _dashboard_cache_ts
+    
+    if _dashboard_cache is None or time.monotonic() - _dashboard_cache_ts >= DASHBOARD_CACHE_TTL:
+        async with _dashboard_cache_lock:
+            # Another request may have refreshed it while this one waited for the lock
+            if _dashboard_cache is None or time.monotonic() - _dashboard_cache_ts >= DASHBOARD_CACHE_TTL:
+                _dashboard_cache = await _collect_dashboard_data()
+                # Encoded once per refresh, left open for the dashboard's "errors" member
+                _dashboard_cache_body = orjson.dumps(_dashboard_cache)[:-1] + b',"errors":'
+                _dashboard_cache_ts = time.monotonic()
+    
+    return _dashboard_cache
+
+def _throttled(name: str, ttl: float, read):
+    """Return the cached result of read(), calling it again once ttl seconds have passed"""
+    now = time.monotonic()
+    cached = _throttled_stats.get(name)
+    if cached is None or now - cached[0] >= ttl:
+        cached = _throttled_stats[name] = (now, read())
+    return cached[1]
+
+def _read_process_stats():
+    """Read this process's stats for the dashboard (blocking)"""
+    process = _process
+    
+    # oneshot() caches the /proc/<pid> reads for the block
+    with process.oneshot():
+        return (
+            process.memory_info(),
+            _throttled("connections", CONNECTIONS_CACHE_TTL, lambda: len(process.connections(kind='inet'))),
+            process.num_threads(),
+            process.cpu_percent(),
+            _throttled("open_files", OPEN_FILES_CACHE_TTL, lambda: len(process.open_files())) if _HAS_OPEN_FILES else 0
+        )
+
+def _read_system_stats():
+    """Read the system-wide stats for the dashboard (blocking)"""
+    return (
+        psutil.cpu_freq(),
+        psutil.virtual_memory(),
+        psutil.disk_usage('/'),
+        psutil.cpu_times(),
+        psutil.net_io_counters()
+    )
+
+async def _collect_dashboard_data():
+    """Collect a fresh system snapshot for the dashboard"""
+    # psutil reads /proc synchronously, so read both groups in worker threads at once
+    process_stats, system_stats = await asyncio.gather(
+        asyncio.to_thread(_read_process_stats),
+        asyncio.to_thread(_read_system_stats)
+    )
+    memory_info, connections_count, threads, process_cpu_percent, open_files_count = process_stats
+    cpu_freq, virtual_memory, disk_usage, cpu_times, network_stats = system_stats
+    
+    # Boot time and uptime
+    current_time = time.time()
+    system_uptime = current_time - _BOOT_TIME
+    app_uptime = current_time - health.start_time
+    
+    return {
+        "system": {
+            "cpu_percent": _cpu_percent,
+            "cpu_count": _CPU_COUNT,
+            "cpu_freq_current": cpu_freq.current if cpu_freq else 0,
+            "cpu_freq_max": cpu_freq.max if cpu_freq else 0,
+            "memory_percent": virtual_memory.percent,
+            "memory_total_gb": round(virtual_memory.total * _INV_GB, 2),
+            "memory_used_gb": round(virtual_memory.used * _INV_GB, 2),
+            "memory_available_gb": round(virtual_memory.available * _INV_GB, 2),
+            "disk_percent": round((disk_usage.used / disk_usage.total) * 100, 1),
+            "disk_total_gb": round(disk_usage.total * _INV_GB, 2),
+            "disk_used_gb": round(disk_usage.used * _INV_GB, 2),
+            "disk_free_gb": round(disk_usage.free * _INV_GB, 2),
+            "network_bytes_sent": network_stats.bytes_sent,
+            "network_bytes_recv": network_stats.bytes_recv,
+            "network_packets_sent": network_stats.packets_sent,
+            "network_packets_recv": network_stats.packets_recv,
+            "uptime_seconds": system_uptime,
+            "platform": _PLATFORM,
+            "hostname": _HOSTNAME,
+            "python_version": _PY_VERSION
+        },
+        "app": {
+            "total_users": len(api.users_db),
+            "total_requests": health.request_count,
+            "memory_usage_mb": round(memory_info.rss * _INV_MB, 2),
+            "memory_usage_percent": round((memory_info.rss / virtual_memory.total) * 100, 2),
+            "active_connections": connections_count,
+            "threads_count": threads,
+            "uptime_seconds": app_uptime,
+            "process_id": _process.pid,
+            "cpu_percent": process_cpu_percent,
+            "open_files": open_files_count,
+            "health_check_failures": getattr(health, 'health_check_failures', 0)
+        },
+        "performance": {
+            "load_average": list(os.getloadavg()) if _HAS_LOADAVG else [0, 0, 0],
+            "cpu_times": {
+                "user": cpu_times.user,
+                "system": cpu_times.system,
+                "idle": cpu_times.idle,
+                "iowait": getattr(cpu_times, 'iowait', 0.0)
+            },
+            "memory_stats": {
+                "cached": getattr(virtual_memory, 'cached', 0),
+                "buffers": getattr(virtual_memory, 'buffers', 0),
+                "shared": getattr(virtual_memory, 'shared', 0)
+            }
+        }
+    }
+
+@router.get("/api/system-history", response_class=ORJSONResponse)
 async def get_system_history():
     """Get historical system performance data for charts with error simulation"""
     
     # Simulate history collection errors
-    if random.random() < 0.02:  # 2% chance
+    if _chance(5):  # ~2% chance
         logger.error("System history collection failed")
         raise HTTPException(
             status_code=503,
@@ -249,10 +393,10 @@ async def get_system_history():
         )
     
     try:
-        current_data = await get_dashboard_data()
+        current_data = await _get_dashboard_snapshot()
         
         return {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_now(),
             "cpu": current_data["system"]["cpu_percent"],
             "memory": current_data["system"]["memory_percent"],
             "disk": current_data["system"]["disk_percent"],
@@ -271,12 +415,22 @@ async def get_system_history():
             detail="Failed to retrieve system history"
         )
 
+def _memory_block(megabytes: int) -> bytearray:
+    """Allocate a filled buffer, so every page of it counts toward RSS"""
+    return bytearray(b"\x01") * (megabytes * 1024 * 1024)
+
+def _cpu_burn(seconds: float):
+    """Keep one core busy for about `seconds` (blocking; run in a worker thread)"""
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(10000))
+
 # Error testing and simulation endpoints for the UI
 @router.post("/api/test-errors")
 async def test_specific_error(request: Request):
     """Test specific error scenarios"""
     try:
-        data = await request.json()
+        data = orjson.loads(await request.body())
         error_type = data.get("error_type")
         
         if error_type == "500":
@@ -299,7 +453,7 @@ async def test_specific_error(request: Request):
         elif error_type == "memory_leak":
             logger.warning("Simulating memory leak for testing")
             # Create temporary memory pressure
-            temp_data = [random.random() for _ in range(1000000)]
+            temp_data = _memory_block(32)
             await asyncio.sleep(5)
             del temp_data
             return {"message": "Memory leak simulation completed"}
@@ -345,51 +499,52 @@ async def test_specific_error(request: Request):
             detail="Failed to execute error test"
         )
 
+# Chaos scenarios and the independent chance of each firing on a run
+_CHAOS_SCENARIOS = (
+    ("cpu_spike", 0.3),
+    ("memory_spike", 0.2),
+    ("slow_response", 0.3),
+    ("error_spike", 0.15),
+    ("connection_drop", 0.05)
+)
+
 @router.post("/api/chaos-monkey")
 async def chaos_monkey():
     """Chaos engineering endpoint - randomly triggers various issues"""
     
-    chaos_scenarios = [
-        {"type": "cpu_spike", "probability": 0.3},
-        {"type": "memory_spike", "probability": 0.2},
-        {"type": "slow_response", "probability": 0.3},
-        {"type": "error_spike", "probability": 0.15},
-        {"type": "connection_drop", "probability": 0.05}
-    ]
-    
     triggered_scenarios = []
     
-    for scenario in chaos_scenarios:
-        if random.random() < scenario["probability"]:
-            triggered_scenarios.append(scenario["type"])
+    for scenario_type, probability in _CHAOS_SCENARIOS:
+        if random.random() < probability:
+            triggered_scenarios.append(scenario_type)
             
-            if scenario["type"] == "cpu_spike":
+            if scenario_type == "cpu_spike":
                 # Simulate CPU intensive work
                 logger.warning("Chaos monkey: CPU spike")
-                start_time = time.time()
-                while time.time() - start_time < 2:
-                    _ = [random.random() for _ in range(1000)]
+                await asyncio.to_thread(_cpu_burn, 2)
             
-            elif scenario["type"] == "memory_spike":
+            elif scenario_type == "memory_spike":
                 # Simulate memory spike
                 logger.warning("Chaos monkey: Memory spike")
-                temp_data = [random.random() for _ in range(500000)]
+                temp_data = _memory_block(16)
                 await asyncio.sleep(3)
                 del temp_data
             
-            elif scenario["type"] == "slow_response":
+            elif scenario_type == "slow_response":
                 # Simulate slow response
                 logger.warning("Chaos monkey: Slow response")
                 await asyncio.sleep(random.uniform(2, 5))
             
-            elif scenario["type"] == "error_spike":
+            elif scenario_type == "error_spike":
                 # Enable random errors temporarily
                 logger.warning("Chaos monkey: Error spike")
                 api.error_simulation["random_errors"] = True
+                api.refresh_error_simulation_flag()
                 await asyncio.sleep(10)
                 api.error_simulation["random_errors"] = False
+                api.refresh_error_simulation_flag()
             
-            elif scenario["type"] == "connection_drop":
+            elif scenario_type == "connection_drop":
                 # Simulate connection issues
                 logger.error("Chaos monkey: Connection drop")
                 raise HTTPException(
@@ -400,7 +555,7 @@ async def chaos_monkey():
     return {
         "message": "Chaos monkey executed",
         "triggered_scenarios": triggered_scenarios,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 @router.post("/api/load-test")
@@ -409,27 +564,22 @@ async def simulate_load():
     logger.info("Starting load simulation")
     
     try:
-        # Simulate multiple concurrent operations
-        tasks = []
-        
-        # Create CPU load
-        for _ in range(5):
-            tasks.append(asyncio.create_task(cpu_intensive_task()))
-        
-        # Create memory allocations
-        for _ in range(3):
-            tasks.append(asyncio.create_task(memory_intensive_task()))
-        
-        # Simulate database operations
-        for _ in range(10):
-            tasks.append(asyncio.create_task(simulate_db_operation()))
+        # Simulate multiple concurrent operations; gather() schedules the coroutines itself
+        tasks = [
+            # Create CPU load
+            *(cpu_intensive_task() for _ in range(5)),
+            # Create memory allocations
+            *(memory_intensive_task() for _ in range(3)),
+            # Simulate database operations
+            *(simulate_db_operation() for _ in range(10))
+        ]
         
         await asyncio.gather(*tasks)
         
         return {
             "message": "Load test completed",
             "operations": len(tasks),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": iso_now()
         }
         
     except Exception as e:
@@ -441,31 +591,30 @@ async def simulate_load():
 
 async def cpu_intensive_task():
     """CPU intensive task for load testing"""
-    start_time = time.time()
-    while time.time() - start_time < 3:
-        _ = sum(random.random() for _ in range(10000))
+    # Burn in a worker thread; spinning here would stall the event loop for 3s per task
+    await asyncio.to_thread(_cpu_burn, 3)
     await asyncio.sleep(0.1)
 
 async def memory_intensive_task():
     """Memory intensive task for load testing"""
-    data = []
-    for _ in range(100000):
-        data.append(random.random())
+    data = _memory_block(4)
     await asyncio.sleep(2)
     del data
 
 async def simulate_db_operation():
     """Simulate database operation with potential failures"""
-    if random.random() < 0.1:  # 10% chance of failure
+    if _chance(26):  # ~10% chance of failure
         raise Exception("Simulated database operation failed")
     
     # Simulate variable response times
     await asyncio.sleep(random.uniform(0.1, 0.5))
     return {"status": "completed"}
 
-@router.get("/api/error-stats")
+@router.get("/api/error-stats", response_class=ORJSONResponse)
 async def get_error_statistics():
     """Get error statistics and simulation status"""
+    disk_usage = psutil.disk_usage('/')
+    
     return {
         "health_check_failures": health.health_check_failures,
         "total_requests": health.request_count,
@@ -474,11 +623,11 @@ async def get_error_statistics():
             "health_errors": health.health_simulation
         },
         "system_status": {
-            "cpu_percent": psutil.cpu_percent(),
+            "cpu_percent": _cpu_percent,
             "memory_percent": psutil.virtual_memory().percent,
-            "disk_percent": round((psutil.disk_usage('/').used / psutil.disk_usage('/').total) * 100, 1)
+            "disk_percent": round((disk_usage.used / disk_usage.total) * 100, 1)
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
 
 @router.post("/api/reset-errors")
@@ -490,15 +639,14 @@ async def reset_error_counters():
     health.health_check_failures = 0
     
     # Disable all error simulations
-    for key in api.error_simulation:
-        api.error_simulation[key] = False
+    api.error_simulation.update(dict.fromkeys(api.error_simulation, False))
+    api.refresh_error_simulation_flag()
     
-    for key in health.health_simulation:
-        health.health_simulation[key] = False
+    health.health_simulation.update(dict.fromkeys(health.health_simulation, False))
     
     logger.info("Error counters reset and simulations disabled")
     
     return {
         "message": "Error statistics reset and simulations disabled",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": iso_now()
     }
\ No newline at end of file
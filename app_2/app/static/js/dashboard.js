@@ -367,12 +367,42 @@ async function generateTraffic(count = 25) {
     }
 }
 
+// Subscribe to dashboard updates pushed by the server, polling where EventSource is missing
+function startDashboardUpdates() {
+    if (!window.EventSource) {
+        setInterval(updateEnhancedDashboard, 3000); // Update every 3 seconds
+        return;
+    }
+    
+    const source = new EventSource('/api/dashboard-data/stream');
+    source.onmessage = (event) => renderEnhancedDashboard(JSON.parse(event.data));
+    // Simulated collection failures arrive as their own event type
+    source.addEventListener('fault', (event) => showDashboardError(new Error(JSON.parse(event.data).detail)));
+    // The server ends each stream after a while; resubscribe without flagging an outage
+    source.addEventListener('reconnect', () => {
+        source.close();
+        startDashboardUpdates();
+    });
+    // EventSource reconnects on its own; just reflect the outage
+    source.onerror = () => showDashboardError(new Error('Dashboard stream interrupted'));
+}
+
 // Enhanced dashboard update function
 async function updateEnhancedDashboard() {
     try {
         const response = await fetch('/api/dashboard-data');
         const data = await response.json();
         
+        renderEnhancedDashboard(data);
+        
+    } catch (error) {
+        showDashboardError(error);
+    }
+}
+
+// Render one dashboard data payload
+function renderEnhancedDashboard(data) {
+    try {
         console.log('Dashboard data received:', data); // Debug log
         
         // Update enhanced metric cards
@@ -395,12 +425,17 @@ async function updateEnhancedDashboard() {
         }
         
     } catch (error) {
-        console.error('Error updating enhanced dashboard:', error);
-        const statusBadge = document.getElementById('status-badge');
-        if (statusBadge) {
-            statusBadge.innerHTML = '<i class="bi bi-exclamation-triangle"></i> Connection Error';
-            statusBadge.className = 'badge bg-danger fs-6';
-        }
+        showDashboardError(error);
+    }
+}
+
+// Flag the dashboard as disconnected
+function showDashboardError(error) {
+    console.error('Error updating enhanced dashboard:', error);
+    const statusBadge = document.getElementById('status-badge');
+    if (statusBadge) {
+        statusBadge.innerHTML = '<i class="bi bi-exclamation-triangle"></i> Connection Error';
+        statusBadge.className = 'badge bg-danger fs-6';
     }
 }
 
@@ -0,0 +1,22 @@
+import time
+from datetime import datetime
+
+# Cached UTC timestamp (datetime and ISO-8601 string), refreshed at most once per millisecond
+_ts_cache = [0.0, datetime.utcfromtimestamp(0), ""]
+
+
+def utc_now() -> datetime:
+    """Return the current UTC time as a naive datetime, cached at 1ms granularity"""
+    t = time.time()
+    if t - _ts_cache[0] > 0.001:
+        now = datetime.utcfromtimestamp(t)
+        _ts_cache[0] = t
+        _ts_cache[1] = now
+        _ts_cache[2] = now.isoformat()
+    return _ts_cache[1]
+
+
+def iso_now() -> str:
+    """Return the current UTC time as an ISO-8601 string, cached at 1ms granularity"""
+    utc_now()
+    return _ts_cache[2]